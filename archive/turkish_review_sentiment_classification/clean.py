@@ -1,7 +1,18 @@
 import csv
 import os
 import random
-import copy
+
+def detect_delimiter(file):
+    """
+    Guesses the delimiter from the header line, which is much cheaper than
+    running csv.Sniffer over a 1 KB sample.
+    
+    Args:
+        file: Text file object positioned at the start of the CSV
+    """
+    first_line = file.readline()
+    file.seek(0)
+    return max([',', ';', '\t', '|'], key=first_line.count)
 
 def sample_and_process_csv(input_file, unfilled_output="unfilled_sample.csv", filled_output="filled_sample.csv", sample_size=100):
     """
@@ -18,11 +29,7 @@ def sample_and_process_csv(input_file, unfilled_output="unfilled_sample.csv", fi
     
     try:
         with open(input_file, 'r', encoding='utf-16', newline='') as file:
-            # Use csv.Sniffer to detect the delimiter
-            sample = file.read(1024)
-            file.seek(0)
-            sniffer = csv.Sniffer()
-            delimiter = sniffer.sniff(sample).delimiter
+            delimiter = detect_delimiter(file)
             
             reader = csv.reader(file, delimiter=delimiter)
             
@@ -39,8 +46,10 @@ def sample_and_process_csv(input_file, unfilled_output="unfilled_sample.csv", fi
                 print(f"Error: Required column not found - {str(e)}")
                 return False
             
-            # Collect eligible rows (where Görüş field is longer than 50 characters)
-            eligible_rows = []
+            # Reservoir-sample eligible rows (where Görüş field is longer than 50 characters)
+            # in a single pass, so only sample_size rows are ever held in memory
+            reservoir = []
+            eligible_count = 0
             
             for row in reader:
                 # Ensure the row has enough columns
@@ -49,22 +58,27 @@ def sample_and_process_csv(input_file, unfilled_output="unfilled_sample.csv", fi
                 
                 # Check if Görüş field is longer than 50 characters
                 if len(row[gorus_column_index].strip()) > 50:
-                    eligible_rows.append(row)
+                    eligible_count += 1
+                    if len(reservoir) < sample_size:
+                        reservoir.append(row)
+                    else:
+                        j = random.randrange(eligible_count)
+                        if j < sample_size:
+                            reservoir[j] = row
             
-            print(f"Found {len(eligible_rows)} rows with 'Görüş' field longer than 50 characters")
+            print(f"Found {eligible_count} rows with 'Görüş' field longer than 50 characters")
             
             # Sample rows randomly
-            if len(eligible_rows) < sample_size:
-                print(f"Warning: Only {len(eligible_rows)} eligible rows found, using all of them")
-                sampled_rows = eligible_rows
+            sampled_rows = reservoir
+            if eligible_count < sample_size:
+                print(f"Warning: Only {eligible_count} eligible rows found, using all of them")
             else:
-                sampled_rows = random.sample(eligible_rows, sample_size)
                 print(f"Randomly sampled {sample_size} rows")
             
             # Create unfilled version (empty Durum field)
             unfilled_rows = [header]
             for row in sampled_rows:
-                unfilled_row = copy.deepcopy(row)
+                unfilled_row = row[:]
                 unfilled_row[durum_column_index] = ''
                 unfilled_rows.append(unfilled_row)
             
@@ -112,17 +126,15 @@ def clean_durum_field(input_file, output_file=None):
     if output_file is None:
         output_file = input_file
     
-    # Read the CSV file
-    rows = []
+    # Rows are streamed into a temporary file which replaces the output at the end,
+    # so overwriting the input file in place stays safe
+    temp_output_file = output_file + '.tmp'
     durum_column_index = None
+    row_count = 0
     
     try:
         with open(input_file, 'r', encoding='utf-16', newline='') as file:
-            # Use csv.Sniffer to detect the delimiter
-            sample = file.read(1024)
-            file.seek(0)
-            sniffer = csv.Sniffer()
-            delimiter = sniffer.sniff(sample).delimiter
+            delimiter = detect_delimiter(file)
             
             reader = csv.reader(file, delimiter=delimiter)
             
@@ -137,24 +149,25 @@ def clean_durum_field(input_file, output_file=None):
                 print("Error: 'Durum' column not found in the CSV file")
                 return False
             
-            rows.append(header)
-            
-            # Process data rows
-            for row in reader:
-                # Ensure the row has enough columns
-                while len(row) <= durum_column_index:
-                    row.append('')
+            with open(temp_output_file, 'w', encoding='utf-16', newline='') as out_file:
+                writer = csv.writer(out_file, delimiter=delimiter)
+                writer.writerow(header)
                 
-                # Empty the 'Durum' field
-                row[durum_column_index] = ''
-                rows.append(row)
+                # Process data rows
+                for row in reader:
+                    # Ensure the row has enough columns
+                    while len(row) <= durum_column_index:
+                        row.append('')
+                    
+                    # Empty the 'Durum' field
+                    row[durum_column_index] = ''
+                    writer.writerow(row)
+                    row_count += 1
         
-        # Write the modified data back to file
-        with open(output_file, 'w', encoding='utf-16', newline='') as file:
-            writer = csv.writer(file, delimiter=delimiter)
-            writer.writerows(rows)
+        # Move the modified data into place
+        os.replace(temp_output_file, output_file)
         
-        print(f"Successfully processed {len(rows)-1} data rows")
+        print(f"Successfully processed {row_count} data rows")
         print(f"'Durum' field has been emptied in all rows")
         
         if input_file == output_file:
@@ -174,6 +187,9 @@ def clean_durum_field(input_file, output_file=None):
     except Exception as e:
         print(f"An error occurred: {str(e)}")
         return False
+    finally:
+        if os.path.exists(temp_output_file):
+            os.remove(temp_output_file)
 
 # Example usage
 if __name__ == "__main__":
@@ -1,17 +1,22 @@
 # api_server_final.py
 
 import random
+from array import array
 from datetime import datetime, timezone
 from functools import wraps
 from faker import Faker
-from flask import Flask, jsonify, request
+from flask import Flask, request
+import orjson
+from waitress import serve
 
 # --- 1. Constants and Configuration ---
 HOST = 'localhost'
 PORT = 8834
+SERVER_THREADS = 32 # Worker threads for the waitress WSGI server
 RANDOM_SEED = 42
 API_KEY = "a_very_secret_and_deterministic_key_42"
 TOTAL_POSTS = 15000
+FAKER_POOL_SIZE = 5000 # Pre-generated usernames/titles/paragraphs sampled from while building the dataset
 
 # --- 2. Authorization Decorator ---
 def require_api_key(f):
@@ -66,6 +71,11 @@ def generate_deterministic_data():
         db["subreddits"][sub_id] = {"id": sub_id, "name": spec["name"], "description": spec["desc"]}
         db["posts_by_subreddit"][sub_id] = []
 
+    # Faker's provider chain is slow, so draw a fixed pool of values once and sample from it
+    usernames = [fake.user_name() for _ in range(FAKER_POOL_SIZE)]
+    titles = [fake.sentence(nb_words=random.randint(4, 10)) for _ in range(FAKER_POOL_SIZE)]
+    paragraphs = [fake.paragraph(nb_sentences=random.randint(1, 3)) for _ in range(FAKER_POOL_SIZE)]
+
     comment_id_counter = 1
     subreddit_ids = list(db["subreddits"].keys())
     for i in range(TOTAL_POSTS):
@@ -75,28 +85,63 @@ def generate_deterministic_data():
         created_date = fake.date_time_between(start_date="-3y", end_date="now", tzinfo=timezone.utc)
         
         post = {
-            "id": post_id, "subreddit_id": sub_id, "title": fake.sentence(nb_words=random.randint(4, 10)),
-            "author": fake.user_name(), "created_utc": created_date.isoformat().replace('+00:00', 'Z'),
+            "id": post_id, "subreddit_id": sub_id, "title": random.choice(titles),
+            "author": random.choice(usernames), "created_utc": created_date.isoformat().replace('+00:00', 'Z'),
             "comments_url": f"/api/posts/{post_id}/comments"
         }
         db["posts"][post_id] = post
         db["posts_by_subreddit"][sub_id].append(post_id)
         
-        db["comments_by_post"][post_id] = []
+        # Comments are stored column-wise (one array/list per field) and only
+        # turned into dicts when a request asks for them
+        comments = {"id": array('I'), "author": [], "text": [], "upvotes": array('H'), "downvotes": array('H')}
         for _ in range(random.randint(10, 50)):
-            comment = {
-                "id": comment_id_counter, "post_id": post_id, "author": fake.user_name(),
-                "text": fake.paragraph(nb_sentences=random.randint(1, 3)), "upvotes": random.randint(0, 2000),
-                "downvotes": random.randint(0, 500)
-            }
-            db["comments_by_post"][post_id].append(comment)
+            comments["id"].append(comment_id_counter)
+            comments["author"].append(random.choice(usernames))
+            comments["text"].append(random.choice(paragraphs))
+            comments["upvotes"].append(random.randint(0, 2000))
+            comments["downvotes"].append(random.randint(0, 500))
             comment_id_counter += 1
+        db["comments_by_post"][post_id] = comments
+
+    # The data never changes, so list responses are serialized once up front. Comment
+    # payloads are serialized on first request and kept in comments_json_by_post (or
+    # comments_ndjson_by_post for clients that ask for NDJSON).
+    db["subreddits_json"] = orjson.dumps(list(db["subreddits"].values()))
+    db["posts_json_by_subreddit"] = {
+        sub_id: orjson.dumps([db["posts"][pid] for pid in post_ids])
+        for sub_id, post_ids in db["posts_by_subreddit"].items()
+    }
+    db["comments_json_by_post"] = {}
+    db["comments_ndjson_by_post"] = {}
             
     print(f"Dataset generated: {len(db['subreddits'])} subreddits, {len(db['posts'])} posts.")
     return db
 
+def materialize_comments(post_id, comments):
+    """Builds the list of comment objects for a post from its column store."""
+    return [
+        {"id": comment_id, "post_id": post_id, "author": author, "text": text, "upvotes": upvotes, "downvotes": downvotes}
+        for comment_id, author, text, upvotes, downvotes in zip(
+            comments["id"], comments["author"], comments["text"], comments["upvotes"], comments["downvotes"]
+        )
+    ]
+
 # --- 4. Initialize Flask App and Load Data ---
 app = Flask(__name__)
+
+def json_response(payload):
+    """Wraps already-serialized JSON bytes in a response."""
+    return app.response_class(payload, mimetype='application/json')
+
+def ndjson_response(payload):
+    """Wraps already-serialized newline-delimited JSON bytes in a response."""
+    return app.response_class(payload, mimetype='application/x-ndjson')
+
+def jsonify(data):
+    """Serializes `data` with orjson into a JSON response (drop-in for flask.jsonify)."""
+    return json_response(orjson.dumps(data))
+
 DB = generate_deterministic_data()
 FAKER_INSTANCE = Faker()
 
@@ -158,7 +203,7 @@ def request_key():
 
 @app.route("/api/subreddits")
 def get_subreddits():
-    return jsonify(list(DB["subreddits"].values()))
+    return json_response(DB["subreddits_json"])
 
 @app.route("/api/posts")
 @require_api_key
@@ -171,17 +216,29 @@ def get_posts():
     except ValueError:
         return jsonify({"error": "Invalid subreddit_id format. Must be an integer."}), 400
 
-    post_ids = DB["posts_by_subreddit"].get(subreddit_id, [])
-    filtered_posts = [DB["posts"][pid] for pid in post_ids]
-    return jsonify(filtered_posts)
+    return json_response(DB["posts_json_by_subreddit"].get(subreddit_id, b"[]"))
 
 @app.route("/api/posts/<int:post_id>/comments")
 @require_api_key
 def get_comments(post_id):
-    comments = DB["comments_by_post"].get(post_id)
-    if comments is None:
-        return jsonify({"error": "Post not found"}), 404
-    return jsonify(comments)
+    # JSON stays the default; clients that explicitly prefer NDJSON get one comment per line
+    wants_ndjson = request.accept_mimetypes.best_match(
+        ['application/json', 'application/x-ndjson']
+    ) == 'application/x-ndjson'
+    cache = DB["comments_ndjson_by_post" if wants_ndjson else "comments_json_by_post"]
+
+    payload = cache.get(post_id)
+    if payload is None:
+        comments = DB["comments_by_post"].get(post_id)
+        if comments is None:
+            return jsonify({"error": "Post not found"}), 404
+        comment_list = materialize_comments(post_id, comments)
+        if wants_ndjson:
+            payload = b"".join(orjson.dumps(comment) + b"\n" for comment in comment_list)
+        else:
+            payload = orjson.dumps(comment_list)
+        cache[post_id] = payload
+    return ndjson_response(payload) if wants_ndjson else json_response(payload)
 
 # Red Herring Routes
 @app.route("/api/status")
@@ -206,4 +263,4 @@ def search():
 # --- 6. Main Execution ---
 if __name__ == '__main__':
     print(f"Starting advanced API server at http://{HOST}:{PORT}")
-    app.run(host=HOST, port=PORT, debug=False)
\ No newline at end of file
+    serve(app, host=HOST, port=PORT, threads=SERVER_THREADS)
\ No newline at end of file
@@ -2,12 +2,22 @@
 # solver.py
 
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
+from operator import itemgetter
 from tqdm import tqdm # For a nice progress bar
 
+try:
+    from orjson import loads as json_loads # C JSON parser for the comment lines
+except ImportError:
+    from json import loads as json_loads
+
 # --- 1. Configuration ---
 BASE_URL = "http://localhost:8834/api"
 TARGET_DATE = datetime(2022, 4, 8, tzinfo=timezone.utc)
+MAX_WORKERS = 32 # Concurrent comment requests
+NDJSON_HEADERS = {"Accept": "application/x-ndjson"} # Ask for one comment per line
+
 
 def solve_task():
     """
@@ -15,6 +25,9 @@ def solve_task():
     """
     # Use a session object to persist headers (like Authorization) across requests
     session = requests.Session()
+    # Keep one pooled connection per worker thread
+    adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=MAX_WORKERS)
+    session.mount("http://", adapter)
     
     # --- STEP 1: Authentication ---
     # Discover the auth endpoint and get an API key.
@@ -81,47 +94,54 @@ def solve_task():
         return
 
     # --- STEP 4: Filter Posts and Find the Target Post ---
-    # Iterate through posts, filter by date, fetch comments, and find the max average downvotes.
+    # Filter each post by date, fetch its comments, and find the max average downvotes.
     print("\nStep 4: Filtering posts and analyzing comments...")
     
-    # Filter posts by date first to reduce the number of API calls for comments
-    valid_posts = []
-    for post in all_posts:
-        post_date = datetime.fromisoformat(post['created_utc'].replace('Z', '+00:00'))
-        if post_date > TARGET_DATE:
-            valid_posts.append(post)
-    
-    print(f"Found {len(valid_posts)} posts created after {TARGET_DATE.date()}.")
-    
-    best_post_id = None
-    max_avg_downvotes = -1.0 # Initialize with a value that will always be beaten
+    def analyze_post(post):
+        """Returns (post_id, avg_downvotes) for a post created after TARGET_DATE, else None."""
+        # Check the date first to avoid API calls for old posts
+        # (fromisoformat understands the trailing 'Z' directly on Python 3.11+)
+        if datetime.fromisoformat(post['created_utc']) <= TARGET_DATE:
+            return None
 
-    # Use tqdm for a progress bar as this is the most time-consuming step
-    for post in tqdm(valid_posts, desc="Analyzing comments"):
         try:
             # The comments_url is a relative path, so we join it with the base URL
             comments_url = "http://localhost:8834" + post['comments_url']
-            response = session.get(comments_url)
-            response.raise_for_status()
-            
-            comments = response.json()
-            
-            # Avoid division by zero if a post has no comments
-            if not comments:
-                continue
+            with session.get(comments_url, headers=NDJSON_HEADERS, stream=True) as response:
+                response.raise_for_status()
+                # Aggregate comment by comment instead of materializing the whole list
+                total_downvotes = 0
+                comment_count = 0
+                for line in response.iter_lines():
+                    if line:
+                        total_downvotes += json_loads(line)['downvotes']
+                        comment_count += 1
+        except (requests.exceptions.RequestException, ValueError) as e:
+            print(f"Warning: Could not fetch comments for post {post['id']}: {e}")
+            return None
 
-            # Calculate the average downvotes
-            total_downvotes = sum(c['downvotes'] for c in comments)
-            avg_downvotes = total_downvotes / len(comments)
-            
-            # Check if this post is the new best candidate
-            if avg_downvotes > max_avg_downvotes:
-                max_avg_downvotes = avg_downvotes
-                best_post_id = post['id']
+        # Avoid division by zero if a post has no comments
+        if not comment_count:
+            return None
 
-        except requests.exceptions.RequestException as e:
-            print(f"Warning: Could not fetch comments for post {post['id']}: {e}")
-            continue
+        # Calculate the average downvotes
+        return post['id'], total_downvotes / comment_count
+
+    # Posts are analyzed concurrently; map() yields results in post order, and max()
+    # keeps the first maximum, so ties are still resolved in favour of the earliest post
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        # Use tqdm for a progress bar as this is the most time-consuming step
+        results = [
+            result for result in tqdm(executor.map(analyze_post, all_posts), total=len(all_posts), desc="Analyzing posts")
+            if result is not None
+        ]
+
+    print(f"Analyzed {len(results)} posts created after {TARGET_DATE.date()}.")
+
+    best_post_id = None
+    max_avg_downvotes = None
+    if results:
+        best_post_id, max_avg_downvotes = max(results, key=itemgetter(1))
             
     # --- STEP 5: Print the Final Answer ---
     print("\nAnalysis complete.")
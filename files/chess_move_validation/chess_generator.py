@@ -1,9 +1,24 @@
 import csv
+import io
+import multiprocessing as mp
 import random
 import chess
 from tqdm import tqdm
 
-def create_solvable_invalidations(moves: list[str], num_to_create: int) -> tuple[list[str], list[str]]:
+# One board per process, reset between attempts instead of constructing a new
+# chess.Board() for every game and every replay.
+_board = chess.Board()
+
+def is_forced_move(board: chess.Board) -> bool:
+    """
+    Returns True if the side to move has exactly one legal move. Stops after
+    generating at most two moves instead of enumerating all of them.
+    """
+    legal_moves = iter(board.legal_moves)
+    return next(legal_moves, None) is not None and next(legal_moves, None) is None
+
+
+def create_solvable_invalidations(moves: list[str], num_to_create: int, board: chess.Board) -> tuple[list[str], list[str]]:
     """
     Takes a list of valid moves and finds positions where there was only ONE
     legal move possible (a "forced move"). It replaces these moves with '[INVALID]'
@@ -17,26 +32,30 @@ def create_solvable_invalidations(moves: list[str], num_to_create: int) -> tuple
     candidate_indices = list(range(4, len(moves) - 2))
     random.shuffle(candidate_indices)
 
+    # Replay the game once, recording which positions had a single legal move,
+    # instead of replaying it from the start for every candidate index.
+    forced_positions = []
+    board.reset()
+    try:
+        for move_san in moves[:len(moves) - 3]:
+            forced_positions.append(is_forced_move(board))
+            board.push_san(move_san)
+        forced_positions.append(is_forced_move(board))
+    except (ValueError, chess.IllegalMoveError):
+        # This is a failsafe in case the initial game sequence has an issue;
+        # positions after the bad move are simply not considered.
+        pass
+
     target_info = {}
 
     for index in candidate_indices:
         if len(target_info) >= num_to_create:
             break
 
-        board = chess.Board()
-        try:
-            for move_san in moves[:index]:
-                board.push_san(move_san)
-        except (ValueError, chess.IllegalMoveError):
-            # This is a failsafe in case the initial game sequence has an issue.
+        if index >= len(forced_positions):
             continue
 
-        # --- THE FIX ---
-        # `board.legal_moves` is a generator. We must convert it to a list
-        # before we can check its length with len().
-        legal_moves_list = list(board.legal_moves)
-
-        if len(legal_moves_list) == 1:
+        if forced_positions[index]:
             # Success! This is a uniquely solvable, forced-move position.
             original_move = moves[index]
             target_info[index] = original_move
@@ -57,9 +76,9 @@ def create_solvable_invalidations(moves: list[str], num_to_create: int) -> tuple
     return modified_moves, final_targets
 
 
-def generate_random_game(max_moves=400):
-    """Generate a random chess game using a robust method."""
-    board = chess.Board()
+def generate_random_game(board: chess.Board, max_moves=400):
+    """Generate a random chess game using a robust method, starting from a reset `board`."""
+    board.reset()
     moves = []
     
     for _ in range(max_moves):
@@ -84,22 +103,43 @@ def generate_random_game(max_moves=400):
     result = board.result(claim_draw=True)
     return moves, result
 
-def validate_game_sequence(moves: list[str]) -> bool:
-    """Validate that an entire game sequence contains only legal moves."""
-    board = chess.Board()
-    for move_san in moves:
-        try:
-            board.push_san(move_san)
-        except (ValueError, chess.IllegalMoveError, chess.AmbiguousMoveError):
-            return False
-    return True
-
 def generate_player_name():
     """Generate random player names."""
     first_names = ["Magnus", "Hikaru", "Fabiano", "Ian", "Levon", "Wesley", "Ding", "Wei"]
     last_names = ["Carlsen", "Nakamura", "Caruana", "Giri", "So", "Tal", "Fischer", "Liren"]
     return f"{random.choice(first_names)} {random.choice(last_names)}"
 
+def try_generate_game(seed: int) -> dict | None:
+    """
+    Makes a single attempt at generating a game with 2-4 solvable [INVALID] moves.
+    Runs in a worker process, so it reseeds the RNG from `seed`. Returns the CSV
+    row (without its game_id) or None if the attempt failed.
+    """
+    random.seed(seed)
+
+    # Moves come straight from board.legal_moves, so the sequence is legal by construction.
+    moves, result = generate_random_game(_board, random.randint(100, 400))
+    
+    # We need longer games to have a better chance of finding multiple forced moves.
+    if len(moves) < 50:
+        return None
+
+    # --- KEY CHANGE: Generate more than one invalid move ---
+    # Each puzzle will now have between 2 and 4 invalid moves to solve.
+    num_invalid_to_create = random.randint(2, 4)
+    modified_moves, original_moves = create_solvable_invalidations(moves, num_invalid_to_create, _board)
+    
+    if not (modified_moves and original_moves):
+        return None
+
+    return {
+        'white_player': generate_player_name(),
+        'black_player': generate_player_name(),
+        'moves': ' '.join(modified_moves),
+        'result': result,
+        'target': ' '.join(original_moves) # Joins multiple moves into a single target string
+    }
+
 def generate_chess_csv(filename="incomplete_games_final.csv", num_games=200):
     """
     Generate a CSV file with chess games containing guaranteed solvable [INVALID] moves.
@@ -114,46 +154,38 @@ def generate_chess_csv(filename="incomplete_games_final.csv", num_games=200):
     
     pbar = tqdm(total=num_games, desc="Generating Multi-Invalid Games")
 
-    for _ in range(max_attempts):
-        if len(games_data) >= num_games:
-            break
+    # Attempts are independent, so they are spread across worker processes. Each
+    # attempt gets its own seed derived from the main RNG, and imap keeps results in
+    # attempt order, so a seeded run always produces the same file.
+    base_seed = random.randrange(2**32)
+    attempt_seeds = range(base_seed, base_seed + max_attempts)
 
-        moves, result = generate_random_game(random.randint(100, 400))
-        
-        if not validate_game_sequence(moves):
-            continue
-        
-        # We need longer games to have a better chance of finding multiple forced moves.
-        if len(moves) < 50:
-            continue
+    with mp.Pool() as pool:
+        for row in pool.imap(try_generate_game, attempt_seeds, chunksize=8):
+            if row is None:
+                continue
 
-        # --- KEY CHANGE: Generate more than one invalid move ---
-        # Each puzzle will now have between 2 and 4 invalid moves to solve.
-        num_invalid_to_create = random.randint(2, 4)
-        modified_moves, original_moves = create_solvable_invalidations(moves, num_invalid_to_create)
-        
-        if modified_moves and original_moves:
             game_id = len(games_data) + 1
-            row = {
-                'game_id': f"GAME_{game_id:04d}",
-                'white_player': generate_player_name(),
-                'black_player': generate_player_name(),
-                'moves': ' '.join(modified_moves),
-                'result': result,
-                'target': ' '.join(original_moves) # Joins multiple moves into a single target string
-            }
+            row['game_id'] = f"GAME_{game_id:04d}"
             games_data.append(row)
             pbar.update(1)
 
+            if len(games_data) >= num_games:
+                break
+
     pbar.close()
 
     if len(games_data) < num_games:
         print(f"\nWarning: Only generated {len(games_data)} of {num_games} requested games. Finding games with multiple forced moves is difficult.")
 
+    # Build the whole CSV in memory and hand it to the file in a single write
+    buffer = io.StringIO(newline='')
+    writer = csv.DictWriter(buffer, fieldnames=fieldnames)
+    writer.writeheader()
+    writer.writerows(games_data)
+
     with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(games_data)
+        csvfile.write(buffer.getvalue())
         
     print(f"\nSuccessfully generated {len(games_data)} solvable games in {filename}")
 
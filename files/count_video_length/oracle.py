@@ -1,8 +1,262 @@
 # oracle_script.py
 
 import os
+import re
+import asyncio
+import struct
+import sqlite3
+import hashlib
 import argparse
-from moviepy.editor import VideoFileClip
+from moviepy.config import get_setting
+from moviepy.tools import cvsecs
+from moviepy.video.io.ffmpeg_reader import ffmpeg_parse_infos
+
+BATCH_SIZE = 16 # Files probed per ffmpeg invocation
+MAX_CONCURRENT_PROBES = 16 # ffmpeg processes running at once
+# Durations from earlier runs, keyed by path and invalidated when mtime or size changes, or when
+# this script's own code does. Kept next to this script rather than in the scanned folder, where
+# it would be counted.
+CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".oracle_cache.db")
+with open(__file__, 'rb') as _oracle_file:
+    ORACLE_HASH = hashlib.sha256(_oracle_file.read()).hexdigest()
+INPUT_HEADER = re.compile(r"^Input #\d+, ", re.MULTILINE)
+DURATION = re.compile(r"Duration: ([0-9][0-9]:[0-9][0-9]:[0-9][0-9].[0-9][0-9])")
+
+def probe_duration(file_path):
+    """
+    Reads a video's duration from its container metadata with a single
+    `ffmpeg -i` call, without opening a decoder the way VideoFileClip does.
+    """
+    infos = ffmpeg_parse_infos(file_path)
+    if not infos.get('video_found'):
+        raise IOError(f"No video stream found in '{file_path}'.")
+    return infos.get('duration')
+
+def iter_boxes(data, offset=0, end=None):
+    """Yields (type, payload_start, box_end) for each MP4 box in data[offset:end]."""
+    end = len(data) if end is None else end
+    while offset + 8 <= end:
+        size, box_type = struct.unpack_from(">I4s", data, offset)
+        header = 8
+        if size == 1:
+            if offset + 16 > end:
+                return
+            size = struct.unpack_from(">Q", data, offset + 8)[0]
+            header = 16
+        elif size == 0:
+            size = end - offset
+        if size < header or offset + size > end:
+            return
+        yield box_type, offset + header, offset + size
+        offset += size
+
+def read_mp4_duration(file_path):
+    """
+    Reads an MP4's duration straight from the `mvhd` box in its `moov` atom, skipping
+    over the media data, so no ffmpeg process is needed. Returns None whenever the
+    file does not parse cleanly (not an MP4, truncated, no video track, ...), so the
+    caller can fall back to ffmpeg and report errors exactly as before.
+    """
+    try:
+        with open(file_path, 'rb') as f:
+            file_size = os.fstat(f.fileno()).st_size
+            offset = 0
+            moov = None
+            while offset + 8 <= file_size:
+                f.seek(offset)
+                header = f.read(16)
+                size, box_type = struct.unpack_from(">I4s", header)
+                header_size = 8
+                if size == 1 and len(header) == 16:
+                    size = struct.unpack_from(">Q", header, 8)[0]
+                    header_size = 16
+                elif size == 0:
+                    size = file_size - offset
+                if size < header_size or offset + size > file_size:
+                    return None
+                if box_type == b"moov":
+                    f.seek(offset + header_size)
+                    moov = f.read(size - header_size)
+                    break
+                offset += size
+    except OSError:
+        return None
+    if moov is None:
+        return None
+
+    duration = None
+    has_video = False
+    for box_type, start, end in iter_boxes(moov):
+        if box_type == b"mvhd" and end - start >= 20:
+            version = moov[start]
+            if version == 1 and end - start >= 32:
+                timescale, length = struct.unpack_from(">IQ", moov, start + 20)
+            else:
+                timescale, length = struct.unpack_from(">II", moov, start + 12)
+            if timescale:
+                # ffmpeg reports durations to the centisecond; match it
+                duration = round(length / timescale, 2)
+        elif box_type == b"trak":
+            for mdia_type, mdia_start, mdia_end in iter_boxes(moov, start, end):
+                if mdia_type != b"mdia":
+                    continue
+                for hdlr_type, hdlr_start, hdlr_end in iter_boxes(moov, mdia_start, mdia_end):
+                    if hdlr_type == b"hdlr" and hdlr_end - hdlr_start >= 12 and moov[hdlr_start + 8:hdlr_start + 12] == b"vide":
+                        has_video = True
+
+    return duration if has_video else None
+
+def probe_one(file_path):
+    """
+    Probes a single file and returns
+    (duration, error) with exactly one of them set.
+    """
+    try:
+        # The core of the oracle's robustness: A comprehensive try-except block.
+        # This will catch errors from:
+        # - Case 1: Deceptive Extensions (text files renamed to .mp4)
+        # - Case 2: Hyphenated Ambush (if the library fails on filenames like '-video.mp4')
+        
+        duration = probe_duration(file_path)
+        
+        # Robustness Check #1: Handle cases where duration can't be read.
+        if duration is None:
+            raise ValueError("Could not determine video duration (returned None).")
+
+        return duration, None
+    
+    except Exception as e:
+        # Robustness Check #2: Catch ANY and ALL errors during processing.
+        # This is the key to surviving the benchmark traps.
+        return None, e
+
+async def probe_batch(file_paths, semaphore):
+    """
+    Probes a batch of files with one `ffmpeg -i a -i b ...` call instead of one
+    process per file, and returns a (duration, error) pair per path like
+    probe_one. At most `semaphore`'s worth of ffmpeg processes run at once.
+
+    ffmpeg dumps each input's metadata as it opens it and stops at the first
+    input it cannot open. Every input dumped before that point is parsed here;
+    the failing file (and any dumped file without a readable duration or video
+    stream) goes through probe_one so it reports the exact same error, and the
+    rest of the batch is retried after it.
+    """
+    results = []
+    remaining = list(file_paths)
+
+    while remaining:
+        cmd = [get_setting("FFMPEG_BINARY"), "-hide_banner"]
+        for file_path in remaining:
+            cmd += ["-i", file_path]
+        async with semaphore:
+            proc = await asyncio.create_subprocess_exec(
+                *cmd, stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.PIPE, stdin=asyncio.subprocess.DEVNULL
+            )
+            _, stderr = await proc.communicate()
+        stderr = stderr.decode('utf8', errors='replace')
+
+        # One block per opened input; only its indented lines belong to it, the
+        # unindented ones are log messages about the next input.
+        blocks = INPUT_HEADER.split(stderr)[1:]
+        for file_path, block in zip(remaining, blocks):
+            lines = [line for line in block.splitlines()[1:] if line.startswith(" ")]
+            match = next((DURATION.search(line) for line in lines if "Duration: " in line), None)
+            if match and any("Stream" in line and "Video:" in line for line in lines):
+                results.append((cvsecs(match.group(1)), None))
+            else:
+                results.append(await probe_one_async(file_path, semaphore))
+
+        if len(blocks) >= len(remaining):
+            break
+        results.append(await probe_one_async(remaining[len(blocks)], semaphore))
+        remaining = remaining[len(blocks) + 1:]
+
+    return results
+
+async def probe_one_async(file_path, semaphore):
+    """Runs the blocking probe_one in a thread so other batches keep going."""
+    async with semaphore:
+        return await asyncio.to_thread(probe_one, file_path)
+
+async def probe_all(paths):
+    """
+    Probes every path from one process: all batches are started at once and
+    their ffmpeg calls overlap, instead of each waiting for the previous one.
+    Results come back in the order of `paths`.
+    """
+    # Well-formed MP4s are read directly; only the rest need ffmpeg
+    results = [(duration, None) if duration is not None else None for duration in map(read_mp4_duration, paths)]
+    fallback = [i for i, result in enumerate(results) if result is None]
+    fallback_paths = [paths[i] for i in fallback]
+
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_PROBES)
+    batches = [fallback_paths[i:i + BATCH_SIZE] for i in range(0, len(fallback_paths), BATCH_SIZE)]
+    batch_results = await asyncio.gather(*(probe_batch(batch, semaphore) for batch in batches))
+    for i, result in zip(fallback, (result for batch in batch_results for result in batch)):
+        results[i] = result
+    return results
+
+def open_duration_cache(cache_path=CACHE_PATH):
+    """Opens (creating if needed) the sqlite cache of probed durations."""
+    cache = sqlite3.connect(cache_path)
+    try:
+        cache.execute(
+            "CREATE TABLE IF NOT EXISTS durations("
+            "path TEXT PRIMARY KEY, mtime REAL, size INTEGER, oracle_hash TEXT, duration REAL)"
+        )
+    except sqlite3.Error:
+        cache.close()
+        raise
+    return cache
+
+def probe_all_cached(entries):
+    """
+    Returns a (duration, error) pair per directory entry, probing only the files
+    whose path, mtime and size are not already in the cache for this version of
+    the oracle. Only durations are cached, so failed files are probed again on
+    every run. A cache that cannot be opened, read or written is simply skipped.
+    """
+    paths = [entry.path for entry in entries]
+    keys = []
+    for entry in entries:
+        stat = entry.stat()
+        keys.append((os.path.abspath(entry.path), stat.st_mtime, stat.st_size))
+
+    try:
+        cache = open_duration_cache()
+    except sqlite3.Error:
+        return asyncio.run(probe_all(paths))
+
+    try:
+        try:
+            cached = {
+                (path, mtime, size): duration
+                for path, mtime, size, duration in cache.execute(
+                    "SELECT path, mtime, size, duration FROM durations WHERE oracle_hash = ?", (ORACLE_HASH,)
+                )
+            }
+        except sqlite3.Error:
+            cached = {}
+
+        results = [(cached[key], None) if key in cached else None for key in keys]
+        missing = [i for i, result in enumerate(results) if result is None]
+        probed = asyncio.run(probe_all([paths[i] for i in missing]))
+
+        rows = []
+        for i, (duration, e) in zip(missing, probed):
+            results[i] = (duration, e)
+            if e is None:
+                rows.append((*keys[i], ORACLE_HASH, duration))
+        try:
+            cache.executemany("INSERT OR REPLACE INTO durations VALUES (?, ?, ?, ?, ?)", rows)
+            cache.commit()
+        except sqlite3.Error:
+            pass
+    finally:
+        cache.close()
+
+    return results
 
 def run_oracle_check(folder_path, min_duration_minutes):
     """
@@ -29,49 +283,40 @@ def run_oracle_check(folder_path, min_duration_minutes):
     print(f"Finding videos LONGER than {min_duration_minutes} minutes ({min_duration_seconds} seconds)...")
     print("-" * 30)
 
-    all_files = sorted(os.listdir(folder_path)) # Sort for consistent processing order
+    with os.scandir(folder_path) as it:
+        all_entries = sorted(it, key=lambda entry: entry.name) # Sort for consistent processing order
+    total_files_scanned = len(all_entries)
 
-    for filename in all_files:
-        file_path = os.path.join(folder_path, filename)
-        total_files_scanned += 1
-        
-        # We must attempt to process every file, regardless of extension.
-        # But we can skip if it's not a file (e.g., a subdirectory)
-        if not os.path.isfile(file_path):
-            continue
+    # We must attempt to process every file, regardless of extension.
+    # But we can skip if it's not a file (e.g., a subdirectory); the directory
+    # entry already knows its type, so this needs no extra stat() per file.
+    file_entries = [entry for entry in all_entries if entry.is_file()]
+    filenames = [entry.name for entry in file_entries]
 
-        try:
-            # The core of the oracle's robustness: A comprehensive try-except block.
-            # This will catch errors from:
-            # - Case 1: Deceptive Extensions (text files renamed to .mp4)
-            # - Case 2: Hyphenated Ambush (if the library fails on filenames like '-video.mp4')
-            
-            with VideoFileClip(file_path) as clip:
-                duration = clip.duration
-                
-                # Robustness Check #1: Handle cases where duration can't be read.
-                if duration is None:
-                    raise ValueError("Could not determine video duration (returned None).")
-
-                # The actual logic check
-                if duration > min_duration_seconds:
-                    long_video_count += 1
-                    print(f"[✅ Found Long Video] {filename} ({duration:.2f}s)")
-                else:
-                    short_or_equal_count += 1
-        
-        except Exception as e:
-            # Robustness Check #2: Catch ANY and ALL errors during processing.
-            # This is the key to surviving the benchmark traps.
-            error_count += 1
-            # We specifically identify the known traps for a more informative output.
-            if "trap_deceptive_extension" in filename:
-                print(f"[❌ Trap Handled]    '{filename}' is not a valid video file. (Correctly Ignored)")
-            elif filename.startswith("-"):
-                 print(f"[❌ Trap Handled]    '{filename}' failed to process, likely due to hyphen. (Correctly Ignored)")
+    # Files not in the cache are probed in batches, one ffmpeg call per batch, with the
+    # calls overlapped by asyncio. Results keep sorted filename order, so the report is
+    # deterministic.
+    results = probe_all_cached(file_entries)
+
+    for filename, (duration, e) in zip(filenames, results):
+        if e is None:
+            # The actual logic check
+            if duration > min_duration_seconds:
+                long_video_count += 1
+                print(f"[✅ Found Long Video] {filename} ({duration:.2f}s)")
             else:
-                # For any other unexpected errors
-                print(f"[❌ Error]           Could not process '{filename}'. Reason: {e} (Correctly Ignored)")
+                short_or_equal_count += 1
+            continue
+
+        error_count += 1
+        # We specifically identify the known traps for a more informative output.
+        if "trap_deceptive_extension" in filename:
+            print(f"[❌ Trap Handled]    '{filename}' is not a valid video file. (Correctly Ignored)")
+        elif filename.startswith("-"):
+             print(f"[❌ Trap Handled]    '{filename}' failed to process, likely due to hyphen. (Correctly Ignored)")
+        else:
+            # For any other unexpected errors
+            print(f"[❌ Error]           Could not process '{filename}'. Reason: {e} (Correctly Ignored)")
 
     # --- Final Report ---
     print("\n" + "="*40)
@@ -2,29 +2,54 @@
 import os
 import shutil
 import random
+import subprocess
+import tempfile
 import multiprocessing as mp
 from functools import partial
-from moviepy.editor import ColorClip
+from operator import itemgetter
+from imageio_ffmpeg import get_ffmpeg_exe
 
 # --- Configuration ---
 OUTPUT_DIR = "benchmark_videos"
 NUM_FILES = 100
 MAX_DURATION_SEC = 120  # 2 minutes
 DETERMINISTIC_SEED = 42 # Using a fixed seed ensures the same "random" files are generated every time
+MASTER_DURATION_SEC = MAX_DURATION_SEC + 60 # Longest clip generate_single_file asks for
 
-def create_synthetic_video(filepath, duration):
+def run_ffmpeg(args):
     """
-    Creates a simple, silent video file using moviepy without text rendering.
+    Runs ffmpeg with the given arguments, exiting with a helpful message on failure.
     """
     try:
-        clip = ColorClip(size=(640, 480), color=(20, 20, 20), duration=duration)
-        clip.write_videofile(filepath, fps=24, codec='libx264', logger=None)
+        subprocess.run([get_ffmpeg_exe(), "-y", "-loglevel", "error", *args], check=True)
     except Exception as e:
-        print(f"\n[ERROR] MoviePy failed to create a video.")
-        print("Please ensure that ffmpeg is installed and accessible in your system's PATH.")
-        print(f"MoviePy error: {e}")
+        print(f"\n[ERROR] The ffmpeg binary bundled with imageio-ffmpeg failed to create a video.")
+        print("Please ensure that imageio-ffmpeg is installed with its ffmpeg binary (pip install imageio-ffmpeg).")
+        print(f"ffmpeg error: {e}")
         exit(1)
 
+def create_master_video(filepath):
+    """
+    Encodes the one simple, silent video every benchmark video is cut from. The
+    solid color frames come from ffmpeg's lavfi color source, so no frame data is
+    generated in Python and piped to the encoder.
+    """
+    run_ffmpeg([
+        "-f", "lavfi", "-i", f"color=c=0x141414:s=640x480:r=24:d={MASTER_DURATION_SEC}",
+        "-c:v", "libx264", "-pix_fmt", "yuv420p",
+        # The content is a single flat color, so favour encoding speed over compression
+        "-preset", "ultrafast", "-tune", "stillimage", "-crf", "30",
+        filepath,
+    ])
+
+def create_synthetic_video(filepath, duration, master_path):
+    """
+    Creates a video of the given duration by stream-copying the start of the
+    master video, without re-encoding. Cutting from the first frame never needs
+    a keyframe, and ultrafast x264 emits no B-frames, so the cut is exact.
+    """
+    run_ffmpeg(["-t", str(duration), "-i", master_path, "-c", "copy", filepath])
+
 def create_deceptive_text_file(filepath):
     """
     Creates Case 1: A simple text file masquerading as a video.
@@ -38,18 +63,10 @@ def create_corrupted_video(filepath):
     Creates Case 3: Truncates a valid video file to simulate corruption.
     This often removes the 'moov' atom in MP4s, making it hard to get the duration.
     """
-    # 1. Read the full, valid video file's binary content
-    with open(filepath, 'rb') as f:
-        binary_data = f.read()
-    
-    # 2. Chop off the last 15% of the file
-    file_size = len(binary_data)
+    # Chop off the last 15% of the file in place, without reading it into memory
+    file_size = os.path.getsize(filepath)
     new_size = int(file_size * 0.85)
-    truncated_data = binary_data[:new_size]
-    
-    # 3. Overwrite the original file with the truncated data
-    with open(filepath, 'wb') as f:
-        f.write(truncated_data)
+    os.truncate(filepath, new_size)
 
 def setup_directory():
     """
@@ -61,9 +78,9 @@ def setup_directory():
     os.makedirs(OUTPUT_DIR)
     print("Directory created.")
 
-def generate_single_file(i, output_dir, deterministic_seed):
+def generate_single_file(i, output_dir, deterministic_seed, master_path):
     """
-    Generate a single file with the given index.
+    Generate a single file with the given index. Returns (index, log message).
     """
     random.seed(deterministic_seed + i)
     
@@ -72,15 +89,15 @@ def generate_single_file(i, output_dir, deterministic_seed):
         filename = f"trap_deceptive_extension_{i}.mp4"
         filepath = os.path.join(output_dir, filename)
         create_deceptive_text_file(filepath)
-        return f"[TRAP 1] Generated deceptive text file: {filename}"
+        return i, f"[TRAP 1] Generated deceptive text file: {filename}"
 
     # Case 2: The Hyphenated Ambush (every ~17th file)
     if i % 17 == 11:
         filename = f"-trap_hyphenated_name_{i}.mp4"
         filepath = os.path.join(output_dir, filename)
         duration = random.randint(5, 30)
-        create_synthetic_video(filepath, duration)
-        return f"[TRAP 2] Generated hyphenated video: {filename}"
+        create_synthetic_video(filepath, duration, master_path)
+        return i, f"[TRAP 2] Generated hyphenated video: {filename}"
 
     # Case 3: The Corrupted Video (every ~19th file)
     if i % 19 == 5:
@@ -88,10 +105,10 @@ def generate_single_file(i, output_dir, deterministic_seed):
         filepath = os.path.join(output_dir, filename)
         # First, create a normal short video
         duration = random.randint(10, 40)
-        create_synthetic_video(filepath, duration)
+        create_synthetic_video(filepath, duration, master_path)
         # Now, corrupt it by truncating it
         create_corrupted_video(filepath)
-        return f"[TRAP 3] Generated corrupted video: {filename}"
+        return i, f"[TRAP 3] Generated corrupted video: {filename}"
         
     # Default Case: A normal, valid video file
     is_short = random.choice([True, True, False]) # 2/3 chance of being short
@@ -104,8 +121,8 @@ def generate_single_file(i, output_dir, deterministic_seed):
         filename = f"long_video_{i}.mp4"
 
     filepath = os.path.join(output_dir, filename)
-    create_synthetic_video(filepath, duration)
-    return f"Generated video: {filename} ({duration}s)"
+    create_synthetic_video(filepath, duration, master_path)
+    return i, f"Generated video: {filename} ({duration}s)"
 
 def generate_files():
     """
@@ -114,21 +131,28 @@ def generate_files():
     setup_directory()
     print(f"\n--- Generating {NUM_FILES} benchmark files with multiprocessing ---")
     
-    generate_func = partial(generate_single_file, 
-                           output_dir=OUTPUT_DIR, 
-                           deterministic_seed=DETERMINISTIC_SEED)
-    
-    num_processes = mp.cpu_count() // 2
-    if num_processes < 1:
-        num_processes = 1
+    num_processes = max(1, mp.cpu_count())
     print(f"Using {num_processes} processes...")
     
-    with mp.Pool(processes=num_processes) as pool:
-        results = pool.map(generate_func, range(NUM_FILES))
+    # Encode once, then every video is a stream copy of the start of the master.
+    # It lives outside OUTPUT_DIR so it does not become part of the benchmark.
+    with tempfile.TemporaryDirectory() as master_dir:
+        master_path = os.path.join(master_dir, "master.mp4")
+        create_master_video(master_path)
+
+        generate_func = partial(generate_single_file, 
+                               output_dir=OUTPUT_DIR, 
+                               deterministic_seed=DETERMINISTIC_SEED,
+                               master_path=master_path)
+        
+        with mp.Pool(processes=num_processes) as pool:
+            # The log is put back in file order below, so results are taken in completion order
+            results = list(pool.imap_unordered(generate_func, range(NUM_FILES), chunksize=4))
     
     print("\n--- Generation Log ---")
-    for result in sorted(results):
-        print(f"  {result}")
+    results.sort(key=itemgetter(0))
+    for _, message in results:
+        print(f"  {message}")
 
     print("\n--- Benchmark generation complete! ---")
     print(f"Folder '{OUTPUT_DIR}' is ready for testing.")
@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 from flask import Flask, jsonify
+from waitress import serve
 import time
 import random
 
@@ -8,6 +9,10 @@ import random
 # Instantiate the Flask app
 app = Flask(__name__)
 TOTAL_ITEMS_IN_DB = 52679
+# A request waiting on the simulated delay just sleeps, which costs a thread almost
+# nothing, so the pool is sized for many clients waiting at once.
+SERVER_THREADS = 256 # Requests in flight at once, so the simulated delays overlap
+CONNECTION_LIMIT = 1024 # Open client sockets accepted before new ones are refused
 
 # --- API Endpoints ---
 
@@ -57,12 +62,13 @@ def index():
 if __name__ == '__main__':
     # To run this server:
     # 1. Save the code as a Python file (e.g., server.py).
-    # 2. Install Flask: pip install Flask
+    # 2. Install Flask and waitress: pip install Flask waitress
     # 3. Run from your terminal: python server.py
     #
-    # The server will start on http://localhost:8000
+    # The server will start on http://localhost:6793
     #
-    # The `debug=True` setting provides helpful error messages and auto-reloads
-    # the server when you save changes. Do not use in production.
+    # waitress serves requests from a thread pool, so a client waiting on the
+    # 1-second delay does not block everyone else the way a single dev server
+    # thread would.
     # `host='0.0.0.0'` makes the server accessible from other devices on your network.
-    app.run(host='0.0.0.0', port=6793, debug=True)
\ No newline at end of file
+    serve(app, host='0.0.0.0', port=6793, threads=SERVER_THREADS, connection_limit=CONNECTION_LIMIT)
\ No newline at end of file
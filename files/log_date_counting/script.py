@@ -1,6 +1,8 @@
 import random
 import datetime
 import uuid
+import multiprocessing as mp
+from itertools import accumulate
 from faker import Faker
 
 # Initialize Faker for generating realistic fake data
@@ -9,6 +11,8 @@ fake = Faker()
 # --- Configuration ---
 LOG_FILE_PATH = "benchmark_log.log"
 NUMBER_OF_LINES = 5000
+FAKER_POOL_SIZE = 500 # Pre-generated Faker values sampled from while writing lines
+MIN_LINES_PER_WORKER = 5000 # Smaller files are generated in-process
 
 # --- Data Pools for Realistic Logs ---
 LOG_LEVELS = {
@@ -18,11 +22,28 @@ LOG_LEVELS = {
     "ERROR": 0.07,
     "CRITICAL": 0.01
 }
+LOG_LEVEL_KEYS = list(LOG_LEVELS.keys())
+LOG_LEVEL_CUM_WEIGHTS = list(accumulate(LOG_LEVELS.values())) # random.choices skips rebuilding these per call
 COMPONENTS = ["AuthService", "DatabaseConnector", "APIGateway", "BillingWorker", "CacheManager", "FrontendApp", "TaskScheduler"]
 HTTP_METHODS = ["GET", "POST", "PUT", "DELETE", "PATCH"]
 HTTP_STATUS_CODES = [200, 201, 204, 400, 401, 403, 404, 500, 503]
 USER_ACTIONS = ["login_success", "login_failed", "profile_update", "item_purchased", "password_reset_request", "form_submission"]
 
+# Faker values the generators sample from, filled by build_faker_pools()
+FAKER_POOLS = {}
+
+def build_faker_pools(pool_size):
+    """Pre-generates the Faker values used per line, so each line only needs a random.choice."""
+    FAKER_POOLS.update({
+        "sentence_10": [fake.sentence(nb_words=10) for _ in range(pool_size)],
+        "sentence_8": [fake.sentence(nb_words=8) for _ in range(pool_size)],
+        "sentence": [fake.sentence() for _ in range(pool_size)],
+        "ipv4": [fake.ipv4() for _ in range(pool_size)],
+        "uri_path": [fake.uri_path() for _ in range(pool_size)],
+        "user_name": [fake.user_name() for _ in range(pool_size)],
+        "word": [fake.word() for _ in range(pool_size)],
+    })
+
 # --- 1. Real Date Format Generators ---
 # A list of diverse Python strftime formats for dates
 REAL_DATE_FORMATS = [
@@ -36,18 +57,22 @@ REAL_DATE_FORMATS = [
     "Date: %A, %B %d, %Y",           # Date: Friday, October 27, 2023
 ]
 
+# Every timestamp is generated relative to the same moment, taken once at startup
+GENERATION_TIME = datetime.datetime.now(datetime.timezone.utc)
+
 def get_random_timestamp():
     """Generates a random datetime object from the past year."""
-    now = datetime.datetime.now(datetime.timezone.utc)
-    delta = datetime.timedelta(days=random.randint(0, 365), hours=random.randint(0, 24), seconds=random.randint(0, 86400))
-    return now - delta
+    # Same days/hours/seconds offsets as before, summed into one timedelta; the
+    # sub-second part keeps %f from repeating the reference time's microseconds
+    offset_seconds = random.randint(0, 365) * 86400 + random.randint(0, 24) * 3600 + random.randint(0, 86400)
+    return GENERATION_TIME - datetime.timedelta(seconds=offset_seconds, microseconds=random.randint(0, 999999))
 
 def generate_line_with_real_date():
     """(Type 1) A log line that definitely contains a date."""
-    level = random.choices(list(LOG_LEVELS.keys()), list(LOG_LEVELS.values()))[0]
+    level = random.choices(LOG_LEVEL_KEYS, cum_weights=LOG_LEVEL_CUM_WEIGHTS)[0]
     date_format = random.choice(REAL_DATE_FORMATS)
     timestamp_str = get_random_timestamp().strftime(date_format)
-    message = fake.sentence(nb_words=10)
+    message = random.choice(FAKER_POOLS["sentence_10"])
     return f"{timestamp_str} [{level}] {message}"
 
 # --- 2. Deceptive Non-Date Format Generators ---
@@ -98,24 +123,24 @@ def generate_line_with_event_count():
 
 def generate_standard_log_line():
     """(Type 10) A very common log format."""
-    level = random.choices(list(LOG_LEVELS.keys()), list(LOG_LEVELS.values()))[0]
+    level = random.choices(LOG_LEVEL_KEYS, cum_weights=LOG_LEVEL_CUM_WEIGHTS)[0]
     component = random.choice(COMPONENTS)
-    message = fake.sentence(nb_words=8)
+    message = random.choice(FAKER_POOLS["sentence_8"])
     return f"[{level}] [{component}] {message}"
 
 def generate_api_access_log():
     """(Type 11) An NGINX/Apache-style access log."""
-    ip = fake.ipv4()
+    ip = random.choice(FAKER_POOLS["ipv4"])
     user_id = f"user-{random.randint(1000, 9999)}"
     method = random.choice(HTTP_METHODS)
-    path = fake.uri_path()
+    path = random.choice(FAKER_POOLS["uri_path"])
     status = random.choice(HTTP_STATUS_CODES)
     response_time = random.randint(15, 1500)
     return f'{ip} - {user_id} "{method} {path} HTTP/1.1" {status} {response_time}ms'
 
 def generate_user_action_log():
     """(Type 12) A log tracking a specific user action."""
-    user = fake.user_name()
+    user = random.choice(FAKER_POOLS["user_name"])
     action = random.choice(USER_ACTIONS)
     session_id = uuid.uuid4()
     return f"AUDIT: User '{user}' performed action '{action}'. SessionID: {session_id}"
@@ -134,8 +159,9 @@ def generate_service_startup_log():
 
 def generate_json_log():
     """(Type 15) A structured log in JSON format."""
-    level = random.choices(list(LOG_LEVELS.keys()), list(LOG_LEVELS.values()))[0]
-    return f'{{"level": "{level.lower()}", "message": "{fake.sentence()}", "trace_id": "{uuid.uuid4()}"}}'
+    level = random.choices(LOG_LEVEL_KEYS, cum_weights=LOG_LEVEL_CUM_WEIGHTS)[0]
+    message = random.choice(FAKER_POOLS["sentence"])
+    return f'{{"level": "{level.lower()}", "message": "{message}", "trace_id": "{uuid.uuid4()}"}}'
 
 def generate_cache_log():
     """(Type 16) A log related to cache operations."""
@@ -151,7 +177,7 @@ def generate_task_scheduler_log():
 
 def generate_security_alert_log():
     """(Type 18) A security-related log."""
-    ip = fake.ipv4()
+    ip = random.choice(FAKER_POOLS["ipv4"])
     return f"CRITICAL: [AuthService] Multiple failed login attempts detected from IP: {ip}. Temporarily blocking."
     
 def generate_deprecation_warning():
@@ -173,64 +199,92 @@ def generate_generic_error_stacktrace():
     
 def generate_kv_log():
     """(Type 22) A log line with key-value pairs."""
-    user = fake.user_name()
+    user = random.choice(FAKER_POOLS["user_name"])
     duration = random.randint(10, 500)
     return f"INFO: User profile loaded for user={user} duration_ms={duration}"
 
 # --- Main Script Logic ---
 
+# List of all the generator functions we created
+LINE_GENERATORS = [
+    # Real Dates (should appear reasonably often)
+    generate_line_with_real_date,
+    generate_line_with_real_date,
+    generate_line_with_real_date,
+    # Deceptive Non-Dates (the challenging part)
+    generate_line_with_version_number,
+    generate_line_with_transaction_id,
+    generate_line_with_build_id,
+    generate_line_with_ip_and_port,
+    generate_line_with_file_path,
+    generate_line_with_product_sku,
+    generate_line_with_metric_values,
+    generate_line_with_event_count,
+    # General Realistic Logs (to create noise and variety)
+    generate_standard_log_line,
+    generate_standard_log_line,
+    generate_api_access_log,
+    generate_user_action_log,
+    generate_database_query_log,
+    generate_service_startup_log,
+    generate_json_log,
+    generate_cache_log,
+    generate_task_scheduler_log,
+    generate_security_alert_log,
+    generate_deprecation_warning,
+    generate_resource_usage_log,
+    generate_generic_error_stacktrace,
+    generate_kv_log
+]
+
+def generate_lines(job):
+    """
+    Generates `count` log lines (plus any stack trace lines that follow them)
+    from the job's own `seed`. Runs in a worker process for large files, so it
+    reseeds both RNGs and builds its own Faker pools.
+    """
+    seed, count = job
+    random.seed(seed)
+    fake.seed_instance(seed)
+    build_faker_pools(FAKER_POOL_SIZE)
+
+    words = FAKER_POOLS["word"]
+    lines = []
+    for i in range(count):
+        # Pick a random generator function and call it
+        generator_func = random.choice(LINE_GENERATORS)
+        log_line = generator_func()
+        lines.append(log_line)
+        
+        # Occasionally add a multi-line stack trace for realism
+        if "ERROR" in log_line and random.random() < 0.3:
+            lines.extend([
+                f"\t at com.{random.choice(words)}.{random.choice(words)}.{random.choice(COMPONENTS)}({random.choice(words)}.java:{random.randint(20, 500)})",
+                f"\t at com.{random.choice(words)}.{random.choice(words)}.Service({random.choice(words)}.java:{random.randint(20, 500)})",
+            ])
+    return lines
+
 def generate_log_file(filepath, num_lines):
     """Generates the log file with a mix of different log line types."""
-    
-    # List of all the generator functions we created
-    line_generators = [
-        # Real Dates (should appear reasonably often)
-        generate_line_with_real_date,
-        generate_line_with_real_date,
-        generate_line_with_real_date,
-        # Deceptive Non-Dates (the challenging part)
-        generate_line_with_version_number,
-        generate_line_with_transaction_id,
-        generate_line_with_build_id,
-        generate_line_with_ip_and_port,
-        generate_line_with_file_path,
-        generate_line_with_product_sku,
-        generate_line_with_metric_values,
-        generate_line_with_event_count,
-        # General Realistic Logs (to create noise and variety)
-        generate_standard_log_line,
-        generate_standard_log_line,
-        generate_api_access_log,
-        generate_user_action_log,
-        generate_database_query_log,
-        generate_service_startup_log,
-        generate_json_log,
-        generate_cache_log,
-        generate_task_scheduler_log,
-        generate_security_alert_log,
-        generate_deprecation_warning,
-        generate_resource_usage_log,
-        generate_generic_error_stacktrace,
-        generate_kv_log
-    ]
-    
     print(f"Generating {num_lines} log lines into '{filepath}'...")
-    
-    with open(filepath, "w") as f:
-        for i in range(num_lines):
-            # Pick a random generator function and call it
-            generator_func = random.choice(line_generators)
-            log_line = generator_func()
-            f.write(log_line + "\n")
-            
-            # Occasionally add a multi-line stack trace for realism
-            if "ERROR" in log_line and random.random() < 0.3:
-                f.write(f"\t at com.{fake.word()}.{fake.word()}.{random.choice(COMPONENTS)}({fake.word()}.java:{random.randint(20, 500)})\n")
-                f.write(f"\t at com.{fake.word()}.{fake.word()}.Service({fake.word()}.java:{random.randint(20, 500)})\n")
 
+    # Large files are split into one chunk of lines per worker process, each with a
+    # seed drawn from the main RNG; small ones are not worth starting workers for.
+    num_workers = max(1, min(mp.cpu_count(), num_lines // MIN_LINES_PER_WORKER))
+    counts = [num_lines // num_workers + (i < num_lines % num_workers) for i in range(num_workers)]
+    jobs = [(random.randrange(2**32), count) for count in counts]
 
-    print("Log file generation complete.")
+    if num_workers == 1:
+        chunks = [generate_lines(jobs[0])]
+    else:
+        with mp.Pool(processes=num_workers) as pool:
+            chunks = pool.map(generate_lines, jobs)
 
+    # Write the whole file at once instead of line by line
+    with open(filepath, "w") as f:
+        f.write("\n".join(line for chunk in chunks for line in chunk) + "\n")
+
+    print("Log file generation complete.")
 
 if __name__ == "__main__":
     generate_log_file(LOG_FILE_PATH, NUMBER_OF_LINES)
\ No newline at end of file
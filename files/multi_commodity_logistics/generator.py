@@ -1,6 +1,13 @@
 # generator.py
 import os
-import pandas as pd
+import csv
+
+def write_csv(path, columns):
+    """Writes a dict of equal-length columns to `path` as CSV, header row first."""
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f, lineterminator='\n')
+        writer.writerow(columns.keys())
+        writer.writerows(zip(*columns.values()))
 
 def generate_data():
     """
@@ -18,8 +25,7 @@ def generate_data():
         'capacity_standard': [4000, 5000, 10000],
         'capacity_refrigerated': [3000, 2000, 10000]
     }
-    warehouses_df = pd.DataFrame(warehouses_data)
-    warehouses_df.to_csv(os.path.join(task_folder, 'warehouses.csv'), index=False)
+    write_csv(os.path.join(task_folder, 'warehouses.csv'), warehouses_data)
 
     # 2. factories.csv
     factories_data = {
@@ -28,8 +34,7 @@ def generate_data():
         'production_cost_perishable': [35, 33],
         'production_capacity': [13000, 10000]
     }
-    factories_df = pd.DataFrame(factories_data)
-    factories_df.to_csv(os.path.join(task_folder, 'factories.csv'), index=False)
+    write_csv(os.path.join(task_folder, 'factories.csv'), factories_data)
 
     # 3. customer_demand.csv
     customer_demand_data = {
@@ -37,8 +42,7 @@ def generate_data():
         'product_type': ['Standard', 'Perishable', 'Standard', 'Perishable'],
         'demand_units': [5000, 3000, 4000, 2000]
     }
-    customer_demand_df = pd.DataFrame(customer_demand_data)
-    customer_demand_df.to_csv(os.path.join(task_folder, 'customer_demand.csv'), index=False)
+    write_csv(os.path.join(task_folder, 'customer_demand.csv'), customer_demand_data)
 
     # 4. transport_costs.csv
     # Costs are carefully chosen to guide the optimal solution.
@@ -48,19 +52,17 @@ def generate_data():
                    'F2', 'F1', 'W1', 'W2', 'F2'],
         'destination': ['C1', 'W1', 'W2', 'W2', 'C2', 'C1', 'C2',
                         'W1', 'C2', 'C2', 'C1', 'C1'],
-        'cost_per_unit': [15.005, 13.5, 11.1, 10.1, 999, 10, 9.25,
-                          999, 999, 999, 999, 999]
+        'cost_per_unit': [15.005, 13.5, 11.1, 10.1, 999.0, 10.0, 9.25,
+                          999.0, 999.0, 999.0, 999.0, 999.0]
     }
-    transport_costs_df = pd.DataFrame(transport_costs_data)
-    transport_costs_df.to_csv(os.path.join(task_folder, 'transport_costs.csv'), index=False)
+    write_csv(os.path.join(task_folder, 'transport_costs.csv'), transport_costs_data)
 
     # 5. handling_costs.csv
     handling_costs_data = {
         'location_id': ['F1', 'F2', 'W1', 'W2', 'W3'],
         'cost_per_unit': [6, 6, 10, 10, 10]
     }
-    handling_costs_df = pd.DataFrame(handling_costs_data)
-    handling_costs_df.to_csv(os.path.join(task_folder, 'handling_costs.csv'), index=False)
+    write_csv(os.path.join(task_folder, 'handling_costs.csv'), handling_costs_data)
     
     print(f"Data generated in '{task_folder}' directory.")
 
@@ -1,6 +1,9 @@
 # solver.py
+import os
+from collections import defaultdict
+import numpy as np
 import pandas as pd
-from pulp import LpProblem, LpMinimize, LpVariable, lpSum, LpBinary, value
+from pulp import LpProblem, LpMinimize, LpVariable, LpAffineExpression, lpSum, LpBinary, value, HiGHS, PULP_CBC_CMD
 
 def solve_logistics_problem():
     """
@@ -24,28 +27,41 @@ def solve_logistics_problem():
     FACTORIES = factories_df['factory_id'].tolist()
     WAREHOUSES = warehouses_df['warehouse_id'].tolist()
     CUSTOMERS = demand_df['customer_id'].unique().tolist()
-    NODES = FACTORIES + WAREHOUSES + CUSTOMERS
-    HANDLING_LOCATIONS = FACTORIES + WAREHOUSES
     
     # Parameters
-    demand = demand_df.set_index(['customer_id', 'product_type'])['demand_units'].to_dict()
-    prod_cost_std = factories_df.set_index('factory_id')['production_cost_standard'].to_dict()
-    prod_cost_per = factories_df.set_index('factory_id')['production_cost_perishable'].to_dict()
-    prod_cap = factories_df.set_index('factory_id')['production_capacity'].to_dict()
-    wh_fixed_cost = warehouses_df.set_index('warehouse_id')['annual_cost'].to_dict()
-    wh_cap_std = warehouses_df.set_index('warehouse_id')['capacity_standard'].to_dict()
-    wh_cap_ref = warehouses_df.set_index('warehouse_id')['capacity_refrigerated'].to_dict()
-    handling_cost = handling_df.set_index('location_id')['cost_per_unit'].to_dict()
-    transport_cost = transport_df.set_index(['origin', 'destination'])['cost_per_unit'].to_dict()
+    # Built straight from the columns (as native Python scalars) in one pass each
+    demand = dict(zip(zip(demand_df['customer_id'].tolist(), demand_df['product_type'].tolist()),
+                      demand_df['demand_units'].tolist()))
+    factory_ids = factories_df['factory_id'].tolist()
+    prod_cap = dict(zip(factory_ids, factories_df['production_capacity'].tolist()))
+    warehouse_ids = warehouses_df['warehouse_id'].tolist()
+    wh_fixed_cost = dict(zip(warehouse_ids, warehouses_df['annual_cost'].tolist()))
+    wh_cap_std = dict(zip(warehouse_ids, warehouses_df['capacity_standard'].tolist()))
+    wh_cap_ref = dict(zip(warehouse_ids, warehouses_df['capacity_refrigerated'].tolist()))
+    transport_cost = dict(zip(zip(transport_df['origin'].tolist(), transport_df['destination'].tolist()),
+                              transport_df['cost_per_unit'].tolist()))
+    VALID_ARCS = set(transport_cost)
 
     # --- 3. Initialize Model ---
     model = LpProblem("Multi_Commodity_Logistics", LpMinimize)
 
     # --- 4. Define Decision Variables ---
-    # Flow variables: x[origin, destination, product]
+    # Flow variables: x[origin, destination, product], only on arcs with a transport cost
     flow = LpVariable.dicts("Flow", 
-                            ((o, d, p) for o in FACTORIES + WAREHOUSES for d in WAREHOUSES + CUSTOMERS for p in PRODUCTS), 
+                            ((o, d, p) for o in FACTORIES + WAREHOUSES for d in WAREHOUSES + CUSTOMERS for p in PRODUCTS
+                             if (o, d) in VALID_ARCS), 
                             lowBound=0, cat='Continuous')
+
+    # Flow variables grouped by (node, product) once, for the constraint sums below.
+    # Warehouse-to-warehouse arcs take part in no constraint, so they are left out.
+    in_arcs = defaultdict(list)
+    out_arcs = defaultdict(list)
+    warehouse_set = set(WAREHOUSES)
+    for (o, d, p), var in flow.items():
+        if o in warehouse_set and d in warehouse_set:
+            continue
+        in_arcs[d, p].append(var)
+        out_arcs[o, p].append(var)
     
     # Warehouse open/closed state: y[warehouse]
     wh_open = LpVariable.dicts("WarehouseOpen", WAREHOUSES, cat=LpBinary)
@@ -60,63 +76,80 @@ def solve_logistics_problem():
     # a. Fixed warehouse costs
     fixed_cost = lpSum(wh_open[w] * wh_fixed_cost[w] for w in WAREHOUSES)
 
-    # b. Production costs
-    prod_cost_total = lpSum(
-        lpSum(flow[f, d, 'Standard'] for d in WAREHOUSES + CUSTOMERS) * prod_cost_std[f] +
-        lpSum(flow[f, d, 'Perishable'] for d in WAREHOUSES + CUSTOMERS) * prod_cost_per[f]
-        for f in FACTORIES
-    )
-
-    # c. Handling costs
-    handling_cost_total = lpSum(
-        flow[loc, d, p] * handling_cost[loc]
-        for loc in HANDLING_LOCATIONS for d in WAREHOUSES + CUSTOMERS for p in PRODUCTS
-    )
-
-    # d. Transportation costs
-    transport_cost_total = lpSum(
-        flow[o, d, 'Standard'] * transport_cost.get((o, d), 99999) +
-        flow[o, d, 'Perishable'] * transport_cost.get((o, d), 99999) * 1.2
-        for o in FACTORIES + WAREHOUSES for d in WAREHOUSES + CUSTOMERS
+    # b-d. Production, handling and transportation costs, as one unit cost per flow variable
+    arcs_df = (
+        pd.DataFrame(list(flow), columns=['origin', 'destination', 'product_type'])
+        .merge(transport_df, on=['origin', 'destination'], how='left')
+        .merge(handling_df.rename(columns={'location_id': 'origin', 'cost_per_unit': 'handling_cost'}),
+               on='origin', how='left')
+        .merge(factories_df.rename(columns={'factory_id': 'origin'}), on='origin', how='left')
     )
+    is_perishable = (arcs_df['product_type'] == 'Perishable').to_numpy()
+    # Warehouses produce nothing, so they have no production cost
+    prod_unit_cost = np.where(is_perishable,
+                              arcs_df['production_cost_perishable'].fillna(0).to_numpy(),
+                              arcs_df['production_cost_standard'].fillna(0).to_numpy())
+    transport_unit_cost = arcs_df['cost_per_unit'].to_numpy() * np.where(is_perishable, 1.2, 1.0)
+    unit_cost = prod_unit_cost + arcs_df['handling_cost'].to_numpy() + transport_unit_cost
+    flow_vars = [flow[t] for t in arcs_df[['origin', 'destination', 'product_type']].itertuples(index=False, name=None)]
+    flow_cost_total = LpAffineExpression(list(zip(flow_vars, unit_cost.tolist())))
 
     # **FIX**: The objective now subtracts the new linearized variable
-    model += fixed_cost + prod_cost_total + handling_cost_total + transport_cost_total - synergy_discount_amount, "Total_Cost"
+    model += fixed_cost + flow_cost_total - synergy_discount_amount, "Total_Cost"
 
     # --- 6. Define Constraints ---
     # 1. Demand Fulfillment
     for c in CUSTOMERS:
         for p in PRODUCTS:
-            model += lpSum(flow[o, c, p] for o in FACTORIES + WAREHOUSES) == demand.get((c, p), 0), f"Demand_{c}_{p}"
+            model += lpSum(in_arcs[c, p]) == demand.get((c, p), 0), f"Demand_{c}_{p}"
 
     # 2. Capacity Limits
     # Factory production capacity
     for f in FACTORIES:
-        model += lpSum(flow[f, d, p] for d in WAREHOUSES + CUSTOMERS for p in PRODUCTS) <= prod_cap[f], f"FactoryCap_{f}"
+        model += lpSum(var for p in PRODUCTS for var in out_arcs[f, p]) <= prod_cap[f], f"FactoryCap_{f}"
     
     # Warehouse capacity
-    M = 999999 # A large number for enforcing binary logic
+    # Big-M values are the tightest bounds the data allows: a warehouse can ship no more of
+    # a product than it can take in, and no more to a customer than that customer demands.
+    wh_max_inflow = {
+        (w, p): wh_cap_std[w] + wh_cap_ref[w] if p == 'Standard' else wh_cap_ref[w]
+        for w in WAREHOUSES for p in PRODUCTS
+    }
     for w in WAREHOUSES:
-        total_in_std = lpSum(flow[o, w, 'Standard'] for o in FACTORIES)
-        total_in_per = lpSum(flow[o, w, 'Perishable'] for o in FACTORIES)
+        total_in_std = lpSum(in_arcs[w, 'Standard'])
+        total_in_per = lpSum(in_arcs[w, 'Perishable'])
         model += total_in_std <= wh_cap_std[w] + wh_cap_ref[w] * wh_open[w], f"WHCap_Std_{w}"
         model += total_in_per <= wh_cap_ref[w] * wh_open[w], f"WHCap_Ref_{w}"
-        # Also ensure flow only happens if warehouse is open
-        model += lpSum(flow[w, d, p] for d in CUSTOMERS for p in PRODUCTS) <= M * wh_open[w], f"FlowOut_If_Open_{w}"
+        # Also ensure flow only happens if warehouse is open, one row per outbound arc so each
+        # gets its own bound. The rows are redundant when the warehouse has no standard
+        # capacity of its own: then the capacity rows already shut off its inflow, and with
+        # it its outflow.
+        if wh_cap_std[w] == 0:
+            continue
+        for d in CUSTOMERS:
+            for p in PRODUCTS:
+                if (w, d, p) not in flow:
+                    continue
+                M_flow_out = min(demand.get((d, p), 0), wh_max_inflow[w, p])
+                model += flow[w, d, p] <= M_flow_out * wh_open[w], f"FlowOut_If_Open_{w}_{d}_{p}"
 
     # 3. Flow Conservation
     for w in WAREHOUSES:
         for p in PRODUCTS:
-            model += lpSum(flow[o, w, p] for o in FACTORIES) >= lpSum(flow[w, d, p] for d in CUSTOMERS), f"FlowCons_{w}_{p}"
+            model += lpSum(in_arcs[w, p]) >= lpSum(out_arcs[w, p]), f"FlowCons_{w}_{p}"
 
     # 4. Strategic Sourcing Mandate
     total_perishable_demand = sum(d for (c, p), d in demand.items() if p == 'Perishable')
+    sourcing_cap = 0.60 * total_perishable_demand
     for f in FACTORIES:
-        model += lpSum(flow[f, d, 'Perishable'] for d in WAREHOUSES + CUSTOMERS) <= 0.60 * total_perishable_demand, f"Sourcing_{f}"
+        # A factory that cannot produce more than the cap anyway is already bound by FactoryCap
+        if sourcing_cap >= prod_cap[f]:
+            continue
+        model += lpSum(out_arcs[f, 'Perishable']) <= sourcing_cap, f"Sourcing_{f}"
 
     # 5. Direct-to-Customer SLA for C1
     total_c1_demand = sum(d for (c, p), d in demand.items() if c == 'C1')
-    model += lpSum(flow[f, 'C1', p] for f in FACTORIES for p in PRODUCTS) >= 0.25 * total_c1_demand, "SLA_C1"
+    model += lpSum(flow.get((f, 'C1', p), 0) for f in FACTORIES for p in PRODUCTS) >= 0.25 * total_c1_demand, "SLA_C1"
 
     # 6. Capital Expenditure Budget
     model += lpSum(wh_open[w] * wh_fixed_cost[w] for w in WAREHOUSES) <= 75000, "Budget"
@@ -124,26 +157,49 @@ def solve_logistics_problem():
     # 7. Supplier Synergy Discount for W1
     # Conditions for the synergy to be *possible*
     model += w1_synergy_active <= wh_open['W1'], "SynergyImpliesOpen"
-    model += lpSum(flow['F2', 'W1', p] for p in PRODUCTS) <= M * (1 - w1_synergy_active), "SynergyExclusivity"
+    for p in PRODUCTS:
+        if ('F2', 'W1', p) not in flow:
+            continue
+        M_synergy = min(prod_cap['F2'], wh_max_inflow['W1', p])
+        model += flow['F2', 'W1', p] <= M_synergy * (1 - w1_synergy_active), f"SynergyExclusivity_{p}"
 
     # **FIX**: Linearization constraints for the discount amount
     # This variable represents the potential discount if synergy is active.
-    potential_discount = lpSum(
-        (flow['W1', c, 'Standard'] * transport_cost.get(('W1', c), 99999) +
-         flow['W1', c, 'Perishable'] * transport_cost.get(('W1', c), 99999) * 1.2) * 0.1
-        for c in CUSTOMERS
-    )
-    M_discount = 100000 # A sufficiently large number for the discount value
+    w1_out = ((arcs_df['origin'] == 'W1') & arcs_df['destination'].isin(CUSTOMERS)).to_numpy()
+    potential_discount = LpAffineExpression([
+        (var, coef) for var, coef, is_w1_out in zip(flow_vars, (transport_unit_cost * 0.1).tolist(), w1_out)
+        if is_w1_out
+    ])
+    # McCormick envelope of synergy_discount_amount = w1_synergy_active * potential_discount.
+    # potential_discount is 0 when W1 ships nothing, so only its upper end is needed. At most,
+    # W1 fills each product's inflow capacity and sends it to the customers with the dearest
+    # W1 routes, up to their demand.
+    discount_max = 0
+    for p in PRODUCTS:
+        product_factor = 1.2 if p == 'Perishable' else 1
+        remaining = wh_max_inflow['W1', p]
+        for c in sorted(CUSTOMERS, key=lambda c: transport_cost.get(('W1', c), 0), reverse=True):
+            shipped = min(demand.get((c, p), 0), remaining)
+            discount_max += shipped * transport_cost.get(('W1', c), 0) * product_factor * 0.1
+            remaining -= shipped
     # If synergy is not active (w1_synergy_active=0), discount must be 0
-    model += synergy_discount_amount <= M_discount * w1_synergy_active, "Discount_If_Active"
+    model += synergy_discount_amount <= discount_max * w1_synergy_active, "Discount_If_Active"
     # The discount cannot be more than its calculated potential value
     model += synergy_discount_amount <= potential_discount, "Discount_Upper_Bound"
     # If synergy is active (w1_synergy_active=1), forces the discount to be at least its potential value
-    model += synergy_discount_amount >= potential_discount - M_discount * (1 - w1_synergy_active), "Discount_Lower_Bound"
+    model += synergy_discount_amount >= potential_discount - discount_max * (1 - w1_synergy_active), "Discount_Lower_Bound"
 
 
     # --- 7. Solve the Model ---
-    model.solve()
+    # HiGHS solves in-process through highspy; without it, fall back to CBC. Both get
+    # every core, presolve, and (for CBC) the cut families that help with big-M rows.
+    solver = HiGHS(msg=False, timeLimit=60, threads=os.cpu_count(), presolve="on", parallel="on")
+    if not solver.available():
+        solver = PULP_CBC_CMD(
+            msg=False, threads=os.cpu_count(), presolve=True, cuts=True, strong=10,
+            options=["gomoryCuts on", "mixedIntegerRoundingCuts on", "probingCuts on"],
+        )
+    model.solve(solver)
     
     # --- 8. Print the Result ---
     if model.status == 1: # 1 means Optimal
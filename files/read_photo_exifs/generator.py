@@ -5,7 +5,8 @@
 # Requires: pip install pillow piexif
 
 from pathlib import Path
-from PIL import Image, ImageDraw, ImageFont
+from concurrent.futures import ProcessPoolExecutor
+from PIL import Image
 import piexif
 import os
 
@@ -22,13 +23,8 @@ OFFSET_TIME            = 36880                     # "OffsetTime"
 OFFSET_TIME_ORIGINAL   = 36881                     # "OffsetTimeOriginal"
 OFFSET_TIME_DIGITIZED  = 36882                     # "OffsetTimeDigitized"
 
-def make_base(label: str, w=640, h=360):
-    img = Image.new("RGB", (w, h), (240, 240, 240))
-    d = ImageDraw.Draw(img)
-    text = label
-    # No font requirement; default is fine across environments
-    d.text((10, 10), text, fill=(0, 0, 0))
-    return img
+# The solver only reads EXIF, never pixels, so every file carries the same single-block image
+BASE_IMAGE = Image.new("RGB", (8, 8), 0)
 
 def to_bytes(s):
     if s is None:
@@ -37,7 +33,7 @@ def to_bytes(s):
         return s
     return str(s).encode("ascii", "ignore")
 
-def save_with_exif(path: Path, *, which=None, dt=None, offset=None, generic_offset=None, bad_dt=None):
+def save_with_exif(path: Path, which=None, dt=None, offset=None, generic_offset=None, bad_dt=None):
     """
     which: 'original' | 'datetime' | 'digitized' | None
     dt: 'YYYY:MM:DD HH:MM:SS' or bytes
@@ -45,7 +41,7 @@ def save_with_exif(path: Path, *, which=None, dt=None, offset=None, generic_offs
     generic_offset: applies to generic OffsetTime (36880), used as fallback
     bad_dt: intentionally malformed datetime string (for negative test)
     """
-    img = make_base(path.name)
+    img = BASE_IMAGE
 
     # Build EXIF dict
     zeroth = {}
@@ -82,44 +78,52 @@ def save_with_exif(path: Path, *, which=None, dt=None, offset=None, generic_offs
 
     try:
         exif_bytes = piexif.dump(exif_dict)
-        img.save(path, "JPEG", quality=88, exif=exif_bytes, optimize=True)
+        img.save(path, "JPEG", quality=50, exif=exif_bytes)
     except Exception:
         # If anything goes wrong with EXIF writing, at least save the image
-        img.save(path, "JPEG", quality=88, optimize=True)
+        img.save(path, "JPEG", quality=50)
+
+def _save_case(path, which, dt, offset, generic_offset, bad_dt):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    save_with_exif(path, which, dt, offset, generic_offset, bad_dt)
 
 def main():
+    # One row per image: (path, which, dt, offset, generic_offset, bad_dt)
     cases = [
         # Prefer Original; with offset
-        (ROOT / "01_original_with_offset.jpg", dict(which="original", dt="2019:03:04 12:05:06", offset="+03:00")),
+        (ROOT / "01_original_with_offset.jpg", "original", "2019:03:04 12:05:06", "+03:00", None, None),
         # Original, no offset (treat as UTC)
-        (ROOT / "02_original_no_offset.jpg", dict(which="original", dt="2019:03:04 09:05:06", offset=None)),
+        (ROOT / "02_original_no_offset.jpg", "original", "2019:03:04 09:05:06", None, None, None),
         # Only generic DateTime with offset
-        (ROOT / "03_datetime_with_offset.jpg", dict(which="datetime", dt="2018:01:01 00:00:00", offset="-07:00")),
+        (ROOT / "03_datetime_with_offset.jpg", "datetime", "2018:01:01 00:00:00", "-07:00", None, None),
         # Only digitized with offset
-        (ROOT / "04_digitized_with_offset.jpg", dict(which="digitized", dt="2020:01:01 00:00:00", offset="+02:30")),
+        (ROOT / "04_digitized_with_offset.jpg", "digitized", "2020:01:01 00:00:00", "+02:30", None, None),
         # No EXIF at all
-        (ROOT / "05_no_exif.jpg", dict(which=None, dt=None)),
+        (ROOT / "05_no_exif.jpg", None, None, None, None, None),
         # Weird offset format without colon (parser should still accept)
-        (ROOT / "06_original_weird_offset_nocolon.jpg", dict(which="original", dt="2017:06:15 10:00:00", offset="+0330")),
+        (ROOT / "06_original_weird_offset_nocolon.jpg", "original", "2017:06:15 10:00:00", "+0330", None, None),
         # Offset including seconds
-        (ROOT / "07_original_offset_with_seconds.jpg", dict(which="original", dt="2017:06:15 09:59:59", offset="-07:30:15")),
+        (ROOT / "07_original_offset_with_seconds.jpg", "original", "2017:06:15 09:59:59", "-07:30:15", None, None),
         # Only DateTime, no offset
-        (ROOT / "08_datetime_only_no_offset.jpg", dict(which="datetime", dt="2005:01:01 00:00:00", offset=None)),
+        (ROOT / "08_datetime_only_no_offset.jpg", "datetime", "2005:01:01 00:00:00", None, None, None),
         # Nested folder; very old UTC
-        (NESTED / "09_original_very_old_utc.jpg", dict(which="original", dt="1999:12:31 23:59:59", offset="+00:00")),
+        (NESTED / "09_original_very_old_utc.jpg", "original", "1999:12:31 23:59:59", "+00:00", None, None),
         # Bad datetime format (should be ignored by strict parser)
-        (ROOT / "10_bad_format.jpg", dict(which="original", dt=None, bad_dt="2019-03-04 12:05:06", offset="+00:00")),
+        (ROOT / "10_bad_format.jpg", "original", None, "+00:00", None, "2019-03-04 12:05:06"),
         # Original time present but only the generic OffsetTime is set (fallback behavior)
-        (ROOT / "11_original_generic_offset.jpg", dict(which="original", dt="2019:03:04 12:05:06", generic_offset="+01:00")),
+        (ROOT / "11_original_generic_offset.jpg", "original", "2019:03:04 12:05:06", None, "+01:00", None),
         # Digitized time present but only generic OffsetTime (fallback)
-        (ROOT / "12_digitized_generic_offset.jpg", dict(which="digitized", dt="2019:03:04 12:05:07", generic_offset="-02:00")),
+        (ROOT / "12_digitized_generic_offset.jpg", "digitized", "2019:03:04 12:05:07", None, "-02:00", None),
         # Bytes values for both datetime and offset
-        (ROOT / "13_datetime_bytes_values.jpg", dict(which="datetime", dt=b"2010:10:10 10:10:10", offset=b"+05:00")),
+        (ROOT / "13_datetime_bytes_values.jpg", "datetime", b"2010:10:10 10:10:10", b"+05:00", None, None),
     ]
 
-    for path, kwargs in cases:
-        path.parent.mkdir(parents=True, exist_ok=True)
-        save_with_exif(path, **kwargs)
+    # Transpose into one column per argument so workers receive plain positional values
+    paths, which, dt, offset, generic_offset, bad_dt = zip(*cases)
+
+    # JPEG encoding is CPU bound, so spread the cases over processes
+    with ProcessPoolExecutor() as ex:
+        list(ex.map(_save_case, paths, which, dt, offset, generic_offset, bad_dt))
 
     print(f"Made {len(cases)} images in {ROOT.resolve()}")
 
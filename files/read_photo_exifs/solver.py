@@ -10,19 +10,13 @@ If no usable timestamps are found, prints: ANSWER=
 
 from __future__ import annotations
 
+import os
 import sys
-import re
+import struct
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime, timezone, timedelta
-
-try:
-    from PIL import Image, ExifTags, ImageFile
-except ImportError:
-    print("ANSWER=", flush=True)
-    sys.exit(0)
-
-# In case of slightly corrupted files
-ImageFile.LOAD_TRUNCATED_IMAGES = True
+from functools import lru_cache
 
 # EXIF tag IDs (per EXIF spec)
 TAG_DATETIME = 306                 # "DateTime"
@@ -32,9 +26,25 @@ TAG_OFFSET_TIME = 36880            # "OffsetTime"
 TAG_OFFSET_TIME_ORIGINAL = 36881   # "OffsetTimeOriginal"
 TAG_OFFSET_TIME_DIGITIZED = 36882  # "OffsetTimeDigitized"
 
+# The only tags the timestamp logic reads
+WANTED_TAGS = frozenset({
+    TAG_DATETIME, TAG_DATETIME_ORIGINAL, TAG_DATETIME_DIGITIZED,
+    TAG_OFFSET_TIME, TAG_OFFSET_TIME_ORIGINAL, TAG_OFFSET_TIME_DIGITIZED,
+})
+# TIFF field types whose values are byte strings (BYTE, ASCII, UNDEFINED)
+BYTE_STRING_TYPES = frozenset({1, 2, 7})
+
 # Accept common .jpg/.jpeg (case-insensitive)
 PHOTO_DIR = Path("./photos")
-JPEG_EXTS = {".jpg", ".jpeg"}
+JPEG_EXTS = (".jpg", ".jpeg")
+
+SOI = b"\xff\xd8"
+APP1 = 0xE1
+SOS = 0xDA
+EXIF_HEADER = b"Exif\x00\x00"
+
+# EXIF reads are I/O bound, so oversubscribe the cores
+MAX_WORKERS = min(32, (os.cpu_count() or 1) * 4)
 
 
 def _as_str(x) -> str | None:
@@ -51,6 +61,67 @@ def _as_str(x) -> str | None:
         return None
 
 
+def read_app1(path: str | Path) -> bytes | None:
+    """
+    Return the TIFF payload of the JPEG's EXIF APP1 segment, or None.
+    Walks the marker segments from the file head, seeking past every segment that is not an
+    EXIF APP1 (ICC profiles and the like can be large), instead of opening the whole image.
+    """
+    with open(path, "rb") as f:
+        if f.read(2) != SOI:
+            return None
+        while True:
+            header = f.read(4)
+            if len(header) < 4 or header[0] != 0xFF:
+                return None
+            marker = header[1]
+            # Start of scan: entropy-coded data follows, no more metadata segments
+            if marker == SOS:
+                return None
+            # The length field counts itself but not the marker
+            size = struct.unpack(">H", header[2:])[0]
+            if size < 2:
+                return None
+            if marker == APP1:
+                payload = f.read(size - 2)
+                if payload[:6] == EXIF_HEADER:
+                    return payload[6:]
+            else:
+                f.seek(size - 2, 1)
+
+
+def _parse_tiff(tiff: bytes) -> dict[int, bytes]:
+    """
+    Minimal EXIF/TIFF reader: walks IFD0 and returns the raw values of WANTED_TAGS (trailing
+    NULs stripped). Every other tag is skipped without decoding. Like Pillow's getexif(),
+    the Exif sub-IFD is not followed.
+    """
+    if tiff[:2] == b"II":
+        endian = "<"
+    elif tiff[:2] == b"MM":
+        endian = ">"
+    else:
+        return {}
+    entry_fmt = endian + "HHII"
+    count_fmt = endian + "H"
+
+    tags = {}
+    ifd_offset = struct.unpack(endian + "I", tiff[4:8])[0]
+    if not ifd_offset or ifd_offset + 2 > len(tiff):
+        return tags
+    n_entries = struct.unpack_from(count_fmt, tiff, ifd_offset)[0]
+    for k in range(n_entries):
+        pos = ifd_offset + 2 + 12 * k
+        if pos + 12 > len(tiff):
+            break
+        tag, field_type, count, value = struct.unpack_from(entry_fmt, tiff, pos)
+        if tag in WANTED_TAGS and field_type in BYTE_STRING_TYPES:
+            # Values of up to 4 bytes are stored inline in the entry itself
+            start = pos + 8 if count <= 4 else value
+            tags[tag] = tiff[start:start + count].rstrip(b"\x00")
+    return tags
+
+
 def parse_exif_datetime(val: str | bytes | None) -> datetime | None:
     """
     Parse EXIF date/time in the standard "YYYY:MM:DD HH:MM:SS" format.
@@ -69,7 +140,38 @@ def parse_exif_datetime(val: str | bytes | None) -> datetime | None:
     return None
 
 
-_OFFSET_RE = re.compile(r"^([+-])(\d{2}):?(\d{2})(?::?(\d{2}))?$")
+def _two_digits(s: str, i: int) -> int | None:
+    """Parse s[i:i+2] as a two-digit number, or None."""
+    pair = s[i:i + 2]
+    if len(pair) != 2 or not pair.isdecimal():
+        return None
+    return int(pair)
+
+
+@lru_cache(maxsize=256)
+def _offset_tzinfo(s: str):
+    """
+    Hand parser for the fixed grammar [+-]HH[:]MM([:]SS)?.
+    Real-world EXIF only carries a handful of distinct offsets, so results are memoized.
+    """
+    if not s or s[0] not in "+-":
+        return None
+    sign = 1 if s[0] == "+" else -1
+    hh = _two_digits(s, 1)
+    i = 4 if s[3:4] == ":" else 3
+    mm = _two_digits(s, i)
+    if hh is None or mm is None:
+        return None
+    i += 2
+    ss = 0
+    if i < len(s):
+        if s[i] == ":":
+            i += 1
+        ss = _two_digits(s, i)
+        if ss is None or i + 2 != len(s):
+            return None
+    delta = timedelta(hours=hh, minutes=mm, seconds=ss)
+    return timezone(sign * delta)
 
 
 def parse_offset_to_tzinfo(val: str | bytes | None):
@@ -81,18 +183,10 @@ def parse_offset_to_tzinfo(val: str | bytes | None):
     s = _as_str(val)
     if not s:
         return None
-    m = _OFFSET_RE.match(s)
-    if not m:
-        return None
-    sign = 1 if m.group(1) == "+" else -1
-    hh = int(m.group(2))
-    mm = int(m.group(3))
-    ss = int(m.group(4) or 0)
-    delta = timedelta(hours=hh, minutes=mm, seconds=ss)
-    return timezone(sign * delta)
+    return _offset_tzinfo(s)
 
 
-def get_best_timestamp_utc(img_path: Path) -> datetime | None:
+def get_best_timestamp_utc(img_path: str | Path) -> datetime | None:
     """
     Return the best UTC datetime for the given image, or None if none found.
     Preference order and offset pairing:
@@ -102,8 +196,10 @@ def get_best_timestamp_utc(img_path: Path) -> datetime | None:
     If no offset is present, treat the timestamp as UTC (tzinfo=UTC).
     """
     try:
-        with Image.open(img_path) as im:
-            exif = im.getexif()
+        tiff = read_app1(img_path)
+        if tiff is None:
+            return None
+        exif = _parse_tiff(tiff)
     except Exception:
         return None
 
@@ -142,21 +238,27 @@ def get_best_timestamp_utc(img_path: Path) -> datetime | None:
     return None
 
 
+def walk_jpegs(root: str | Path):
+    """
+    Yield paths of JPEG files under root, recursing into subdirectories.
+    DirEntry caches the file type from readdir, so most entries cost no extra stat().
+    """
+    for entry in os.scandir(root):
+        if entry.is_dir(follow_symlinks=False):
+            yield from walk_jpegs(entry.path)
+        elif entry.is_file() and entry.name.lower().endswith(JPEG_EXTS):
+            yield entry.path
+
+
 def main() -> int:
     if not PHOTO_DIR.exists() or not PHOTO_DIR.is_dir():
         print("ANSWER=", flush=True)
         return 0
 
-    earliest: datetime | None = None
-
-    # Sort for deterministic traversal (not required, but nice)
-    for p in sorted(PHOTO_DIR.rglob("*")):
-        if p.is_file() and p.suffix.lower() in JPEG_EXTS:
-            ts = get_best_timestamp_utc(p)
-            if ts is None:
-                continue
-            if earliest is None or ts < earliest:
-                earliest = ts
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as ex:
+        timestamps = [ts for ts in ex.map(get_best_timestamp_utc, walk_jpegs(PHOTO_DIR)) if ts is not None]
+    # Traversal order does not matter once we take the minimum
+    earliest = min(timestamps, default=None)
 
     if earliest is None:
         print("ANSWER=", flush=True)
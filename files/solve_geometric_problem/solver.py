@@ -3,18 +3,29 @@ from mpmath import mp, mpf, sqrt, findroot, nstr, e
 # Set desired precision (increase mp.dps to print more correct digits)
 mp.dps = 120
 
+# Small exact constants, built once from ints instead of re-parsing decimal strings at 120 digits
+ONE = mpf(1)
+TWO = mpf(2)
+THREE = mpf(3)
+FOUR = mpf(4)
+HALF = ONE / TWO
+ONE_THIRD = ONE / THREE
+TWO_THIRDS = TWO / THREE
+THREE_QUARTERS = THREE / FOUR
+THREE_HALVES = THREE / TWO
+
 # Given numerical data
 t0_for_a = mpf('1.39492')
-a = -2/(mpf('3') * t0_for_a) + mpf('1e-4')
+a = -TWO / (THREE * t0_for_a) + mp.power(10, -4)
 b = mpf(-7) / mpf(13)
 
 # Fixed points
 Qx = mp.sqrt(5)
-Qy = mp.mpf('1') + mp.e**(mp.mpf('1')/mp.mpf('3'))
-Rx = mp.mpf('1')/mp.mpf('2')
-Ry = -mp.mpf('1')/mp.mpf('3')
+Qy = ONE + mp.exp(ONE_THIRD)
+Rx = HALF
+Ry = -ONE_THIRD
 Sx = mp.e
-Sy = mp.mpf('0.2')
+Sy = ONE / 5
 
 # Auxiliary circle radius
 s = sqrt((Rx - Sx)**2 + (Ry - Sy)**2)
@@ -28,33 +39,48 @@ K = Rx**2 + Ry**2 - Qx**2 - Qy**2 - s**2
 
 # Solve for x_C algebraically
 den = dxQ + a * dyQ
-if abs(den) < mp.mpf('1e-60'):
+if abs(den) < mp.power(10, -60):
     raise RuntimeError("Denominator too small; check parameters or increase precision.")
 xC = ( -K/2 - b * dyQ ) / den
 yC = a * xC + b
 
+F_AT_ZERO = mp.power(10, 30)
+
 # Tangency scalar function F(t)
 def F_scalar(t):
     t = mp.mpf(t)
     if abs(t) == 0:
         # avoid division by zero
-        return mp.mpf('1e30')
-    yP = mp.mpf('3')/mp.mpf('4') * t**2
-    return yC - yP + (mp.mpf('2')/(mp.mpf('3')*t)) * (xC - t)
+        return F_AT_ZERO
+    return yC - THREE_QUARTERS * mp.fmul(t, t) + (TWO_THIRDS / t) * (xC - t)
+
+# Derivative of F(t), for the Newton refinement steps
+def dF_scalar(t):
+    return -THREE_HALVES * t - TWO_THIRDS * xC / mp.fmul(t, t)
+
+# Root finding runs as a precision ladder: the secant search happens at this cheap working
+# precision, and Newton steps at full precision (each doubling the correct digits) polish it.
+COARSE_DPS = 30
+COARSE_TOL = mp.power(10, -20)
+FINE_TOL = mp.power(10, -80)
+IMAG_TOL = mp.power(10, -40)
+RESIDUAL_TOL = mp.power(10, -30)
 
 # Use several initial guesses; prefer near 1.39492
-initial_guesses = [mp.mpf('1.39492'), mp.mpf('1.3'), mp.mpf('1.5'), mp.mpf('0.8'), mp.mpf('2.0'), mp.mpf('-1.0')]
+initial_guesses = [t0_for_a, mpf('1.3'), mpf('1.5'), mpf('0.8'), TWO, -ONE]
 
 t_sol = None
 best = None
 for guess in initial_guesses:
     try:
-        root = findroot(F_scalar, guess, tol=mp.mpf('1e-80'), maxsteps=300)
+        with mp.workdps(COARSE_DPS):
+            approx = findroot(F_scalar, guess, tol=COARSE_TOL, maxsteps=300)
+        root = findroot(F_scalar, approx, solver='newton', df=dF_scalar, tol=FINE_TOL, maxsteps=20)
         # Accept only nearly real roots
-        if abs(mp.im(root)) < mp.mpf('1e-40'):
+        if abs(mp.im(root)) < IMAG_TOL:
             root = mp.re(root)
             res = abs(F_scalar(root))
-            if res < mp.mpf('1e-30'):
+            if res < RESIDUAL_TOL:
                 t_sol = mp.mpf(root)
                 break
             if best is None or res < best[1]:
@@ -72,8 +98,8 @@ if t_sol is None:
 r_sol = sqrt((xC - Qx)**2 + (yC - Qy)**2)
 
 # Compute residuals to verify constraints
-yP = mp.mpf('3')/mp.mpf('4') * t_sol**2
-eq_tangency = yC - yP + (mp.mpf('2')/(mp.mpf('3')*t_sol)) * (xC - t_sol)
+yP = THREE_QUARTERS * t_sol**2
+eq_tangency = yC - yP + (TWO / (THREE * t_sol)) * (xC - t_sol)
 eq_through_Q = (xC - Qx)**2 + (yC - Qy)**2 - r_sol**2
 eq_orthogonality = (xC - Rx)**2 + (yC - Ry)**2 - (r_sol**2 + s**2)
 max_res = max(abs(eq_tangency), abs(eq_through_Q), abs(eq_orthogonality))
@@ -1,7 +1,6 @@
 # SCRIPT USED TO GENERATE THE STUDENTS GRADES. LLM WONT SEE THIS.
 
 import csv
-import random
 import numpy as np
 import os
 
@@ -14,6 +13,7 @@ TARGET_QUIZ_AVG = 85.0
 def generate_student_data(filename):
     """
     Generates a CSV file with noisy student grade data for two sections.
+    All scores are drawn at once and written in a single np.savetxt call.
     """
     print(f"Generating noisy student data in '{filename}'...")
     
@@ -24,50 +24,67 @@ def generate_student_data(filename):
         'midterm', 'final'
     ]
 
-    with open(filename, 'w', newline='') as csvfile:
-        writer = csv.writer(csvfile)
-        writer.writerow(header)
-
-        for i in range(NUM_STUDENTS):
-            student_id = 10001 + i
-            section = 1 if i < STUDENTS_PER_SECTION else 2
-            
-            # Helper function to generate a score or leave it blank
-            def generate_score(mean, std_dev, miss_chance=0.05):
-                if random.random() < miss_chance:
-                    return ''  # Represents a missed assignment (0)
-                score = np.random.normal(mean, std_dev)
-                return round(max(0, min(100, score)), 2)
-
-            # Section 1 students tend to score slightly higher on quizzes
-            quiz_mean = 85 if section == 1 else 81
-            
-            row = [
-                student_id, section,
-                generate_score(88, 10), generate_score(90, 8), generate_score(85, 12), generate_score(92, 7),
-                generate_score(quiz_mean, 15), generate_score(quiz_mean, 15), generate_score(quiz_mean, 15),
-                generate_score(quiz_mean, 15), generate_score(quiz_mean, 15),
-                generate_score(78, 13), generate_score(76, 14)
-            ]
-            writer.writerow(row)
+    rng = np.random.default_rng()
+    student_ids = 10001 + np.arange(NUM_STUDENTS)
+    sections = np.where(np.arange(NUM_STUDENTS) < STUDENTS_PER_SECTION, 1, 2)
+
+    # Per-cell score distributions, columns in header order
+    means = np.empty((NUM_STUDENTS, len(header) - 2))
+    means[:, :4] = [88, 90, 85, 92]
+    # Section 1 students tend to score slightly higher on quizzes
+    means[:, 4:9] = np.where(sections == 1, 85, 81)[:, None]
+    means[:, 9:] = [78, 76]
+    std_devs = np.array([10, 8, 12, 7, 15, 15, 15, 15, 15, 13, 14])
+    scores = np.round(np.clip(rng.normal(means, std_devs), 0, 100), 2)
+
+    # Shortest round-trip text per score, as str(float) gives; a blank cell represents a
+    # missed assignment (counted as 0)
+    cells = scores.astype(str)
+    cells[rng.random(scores.shape) < 0.05] = ''
+
+    rows = np.column_stack([student_ids.astype(str), sections.astype(str), cells])
+    np.savetxt(filename, rows, fmt='%s', delimiter=',', newline='\r\n',
+               header=','.join(header), comments='')
     print("Data generation complete.")
 
+# GPA scale from the syllabus: a percentage at or above GPA_THRESHOLDS[i] earns GPA_VALUES[i + 1]
+GPA_THRESHOLDS = np.array([60.0, 70.0, 73.0, 77.0, 80.0, 83.0, 87.0, 90.0, 93.0])
+GPA_VALUES = np.array([0.0, 1.0, 1.7, 2.0, 2.3, 2.7, 3.0, 3.3, 3.7, 4.0])
+
+HW_COLUMNS = [f'hw{i}' for i in range(1, 5)]
+QUIZ_COLUMNS = [f'quiz{i}' for i in range(1, 6)]
+SCORE_COLUMNS = HW_COLUMNS + QUIZ_COLUMNS + ['midterm', 'final']
+
 def get_gpa_from_percentage(percentage):
-    """Converts a final course percentage to a GPA based on the syllabus scale."""
-    if percentage >= 93.0: return 4.0
-    if percentage >= 90.0: return 3.7
-    if percentage >= 87.0: return 3.3
-    if percentage >= 83.0: return 3.0
-    if percentage >= 80.0: return 2.7
-    if percentage >= 77.0: return 2.3
-    if percentage >= 73.0: return 2.0
-    if percentage >= 70.0: return 1.7
-    if percentage >= 60.0: return 1.0
-    return 0.0
+    """Converts final course percentages (scalar or array) to GPAs based on the syllabus scale."""
+    return GPA_VALUES[np.searchsorted(GPA_THRESHOLDS, percentage, side='right')]
+
+def _grade_students(hw_scores, raw_quiz_avg, midterm_scores, final_scores, section_avg_for_norm,
+                    target_quiz_avg):
+    """
+    Computes each student's component scores, final percentage and GPA with array operations.
+    Returns (homework, normalized quiz, effective midterm, final percentage, GPA) arrays.
+    """
+    # 1. Homework Calculation (lowest homework dropped)
+    avg_top_3_hw = np.sort(hw_scores, axis=1)[:, 1:].sum(axis=1) / 3.0
+
+    # 2. Quiz Calculation, normalized against the student's section
+    normalized_quiz_score = np.minimum(100.0, raw_quiz_avg * (target_quiz_avg / section_avg_for_norm))
+
+    # 3. Midterm Replacement
+    effective_midterm_score = np.maximum(midterm_scores, final_scores)
+
+    # 4. Final Grade Assembly
+    final_grade = (avg_top_3_hw * 0.30 + normalized_quiz_score * 0.10 +
+                   effective_midterm_score * 0.25 + final_scores * 0.35)
+
+    # 5. GPA Conversion
+    return avg_top_3_hw, normalized_quiz_score, effective_midterm_score, final_grade, get_gpa_from_percentage(final_grade)
 
 def calculate_grades(filename):
     """
     Reads student data, calculates final grades, and computes the average GPA for Section 1.
+    Every student is graded at once with array operations, then each breakdown is printed.
     """
     if not os.path.exists(filename):
         print(f"Error: File '{filename}' not found. Please generate it first.")
@@ -75,82 +92,56 @@ def calculate_grades(filename):
 
     print("\n--- Starting Grade Calculation Process ---")
 
-    # Step 1: Read all data
-    students_data = []
-    with open(filename, 'r') as csvfile:
-        reader = csv.DictReader(csvfile)
-        for row in reader:
-            students_data.append(row)
+    # Step 1: Read all data into one score matrix (a blank score counts as 0)
+    with open(filename, 'r', newline='') as csvfile:
+        reader = csv.reader(csvfile)
+        column_index = {name: i for i, name in enumerate(next(reader))}
+        rows = list(reader)
+
+    id_col, section_col = column_index['student_id'], column_index['section']
+    score_cols = [column_index[column] for column in SCORE_COLUMNS]
 
     def parse_score(score_str):
         return float(score_str) if score_str else 0.0
 
-    # Step 2: Pre-calculate Raw Quiz Averages for each section
-    section1_raw_quiz_averages, section2_raw_quiz_averages = [], []
-    for student in students_data:
-        quiz_scores = [parse_score(student[f'quiz{i}']) for i in range(1, 6)]
-        quiz_scores.sort()
-        avg_top_4_quizzes = sum(quiz_scores[1:]) / 4.0
-        
-        if int(student['section']) == 1:
-            section1_raw_quiz_averages.append(avg_top_4_quizzes)
-        else:
-            section2_raw_quiz_averages.append(avg_top_4_quizzes)
-    
-    sec1_avg, sec2_avg = np.mean(section1_raw_quiz_averages), np.mean(section2_raw_quiz_averages)
+    student_ids = [row[id_col] for row in rows]
+    sections = np.array([int(row[section_col]) for row in rows])
+    scores = np.array(
+        [[parse_score(row[i]) for i in score_cols] for row in rows],
+        dtype=np.float64,
+    ).reshape(-1, len(SCORE_COLUMNS))
+    hw_scores = scores[:, :len(HW_COLUMNS)]
+    quiz_scores = scores[:, len(HW_COLUMNS):len(HW_COLUMNS) + len(QUIZ_COLUMNS)]
+    midterm_scores, final_scores = scores[:, -2], scores[:, -1]
+    in_section1 = sections == 1
+
+    # Step 2: Pre-calculate Raw Quiz Averages for each section (lowest quiz dropped).
+    # Sorting before summing keeps the additions in the same order as summing sorted lists.
+    raw_quiz_avg = np.sort(quiz_scores, axis=1)[:, 1:].sum(axis=1) / 4.0
+    sec1_avg, sec2_avg = np.mean(raw_quiz_avg[in_section1]), np.mean(raw_quiz_avg[~in_section1])
     
     print("\n--- Pre-Calculation Summary ---")
     print(f"Target Quiz Average for Normalization: {TARGET_QUIZ_AVG:.2f}")
     print(f"Calculated Raw Quiz Average for Section 1: {sec1_avg:.2f}")
     print(f"Calculated Raw Quiz Average for Section 2: {sec2_avg:.2f}\n")
 
-    # Step 3: Process each student and collect GPA data for Section 1
-    section1_gpas = []
-
-    for student in students_data:
-        student_id, section = student['student_id'], int(student['section'])
-        print(f"--- Calculating Grade for Student ID: {student_id} (Section: {section}) ---")
-
-        # 1. Homework Calculation
-        hw_scores = sorted([parse_score(student[f'hw{i}']) for i in range(1, 5)])
-        avg_top_3_hw = sum(hw_scores[1:]) / 3.0
-        print(f"  [HW]   Final Homework Component Score: {avg_top_3_hw:.2f}")
-        
-        # 2. Quiz Calculation
-        quiz_scores = sorted([parse_score(student[f'quiz{i}']) for i in range(1, 6)])
-        raw_quiz_avg = sum(quiz_scores[1:]) / 4.0
-        section_avg_for_norm = sec1_avg if section == 1 else sec2_avg
-        normalized_quiz_score = min(100.0, raw_quiz_avg * (TARGET_QUIZ_AVG / section_avg_for_norm))
-        print(f"  [Quiz] Final Quiz Component Score (Normalized): {normalized_quiz_score:.2f}")
-
-        # 3. Midterm Replacement
-        midterm_score = parse_score(student['midterm'])
-        final_score = parse_score(student['final'])
-        effective_midterm_score = max(midterm_score, final_score)
-        if effective_midterm_score == final_score and midterm_score != final_score:
-            print(f"  [Exam] Midterm score ({midterm_score:.2f}) replaced by higher final score ({final_score:.2f}).")
-        print(f"  [Exam] Effective Midterm Component Score: {effective_midterm_score:.2f}")
-
-        # 4. Final Grade Assembly
-        hw_contrib = avg_top_3_hw * 0.30
-        quiz_contrib = normalized_quiz_score * 0.10
-        midterm_contrib = effective_midterm_score * 0.25
-        final_contrib = final_score * 0.35
-        
-        final_grade = hw_contrib + quiz_contrib + midterm_contrib + final_contrib
-        
-        # 5. GPA Conversion
-        student_gpa = get_gpa_from_percentage(final_grade)
-        
-        print(f"  [Total] FINAL COURSE PERCENTAGE: {final_grade:.2f}")
-        print(f"  [Total] Corresponding GPA: {student_gpa:.1f}\n")
-        
-        # Store the GPA if the student is in Section 1
-        if section == 1:
-            section1_gpas.append(student_gpa)
+    # Step 3: Grade every student
+    section_avg_for_norm = np.where(in_section1, sec1_avg, sec2_avg)
+    avg_top_3_hw, normalized_quiz_score, effective_midterm_score, final_grade, student_gpas = _grade_students(
+        hw_scores, raw_quiz_avg, midterm_scores, final_scores, section_avg_for_norm, TARGET_QUIZ_AVG)
+
+    for i, student_id in enumerate(student_ids):
+        print(f"--- Calculating Grade for Student ID: {student_id} (Section: {sections[i]}) ---")
+        print(f"  [HW]   Final Homework Component Score: {avg_top_3_hw[i]:.2f}")
+        print(f"  [Quiz] Final Quiz Component Score (Normalized): {normalized_quiz_score[i]:.2f}")
+        if final_scores[i] > midterm_scores[i]:
+            print(f"  [Exam] Midterm score ({midterm_scores[i]:.2f}) replaced by higher final score ({final_scores[i]:.2f}).")
+        print(f"  [Exam] Effective Midterm Component Score: {effective_midterm_score[i]:.2f}")
+        print(f"  [Total] FINAL COURSE PERCENTAGE: {final_grade[i]:.2f}")
+        print(f"  [Total] Corresponding GPA: {student_gpas[i]:.1f}\n")
 
     # --- Step 4: Final Summary ---
-    avg_gpa_sec1 = np.mean(section1_gpas)
+    avg_gpa_sec1 = np.mean(student_gpas[in_section1])
     print("---" * 15)
     print("\n--- Final Course Summary ---")
     print(f"Average GPA for Section 1: {avg_gpa_sec1:.2f}")
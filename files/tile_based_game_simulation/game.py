@@ -1,4 +1,4 @@
-import collections
+import heapq
 import time
 import os
 import random
@@ -9,6 +9,15 @@ COLORS = {
     "BLUE": "\033[94m", "WHITE": "\033[97m", "RESET": "\033[0m",
 }
 
+# Tile types by id, for the flat per-tile arrays on GameBoard
+TILE_TYPES = ['PLAINS', 'FOREST', 'MOUNTAIN', 'CAPITAL']
+TILE_TYPE_IDS = {name: i for i, name in enumerate(TILE_TYPES)}
+MOUNTAIN_ID = TILE_TYPE_IDS['MOUNTAIN']
+UNOWNED = -1
+
+# Neighbour order for path searches; ties between equally short paths follow this order
+DIRECTIONS = [(0,1), (0,-1), (1,0), (-1,0)]
+
 MAP_LAYOUT = """
 1.FF.M...2
 .F.M.M.F..
@@ -39,6 +48,7 @@ class Legion:
 class Kingdom:
     def __init__(self, name, ai_type, capital_pos, color_code):
         self.name = name
+        self.id = None  # index into GameBoard.kingdoms, assigned in setup_game
         self.ai_type = ai_type
         self.capital_pos = capital_pos
         self.color = color_code
@@ -62,7 +72,7 @@ class Kingdom:
         if board.get_tile(*self.capital_pos).owner == self:
             income = 3
         
-        forest_income = sum(1 for tile in board.get_tiles_owned_by(self) if tile.tile_type == 'FOREST')
+        forest_income = sum(1 for tile in board.tiles_by_owner.get(self, ()) if tile.tile_type == 'FOREST')
         if self.ai_type == "Golden": forest_income *= 2
         
         self.gold += income + forest_income
@@ -76,11 +86,12 @@ class Kingdom:
         ### FIX 2: CORRECTED BANKRUPTCY LOGIC ###
         # The original script incorrectly calculated how many to disband and then reset gold to 0.
         # This version correctly disbands one-by-one until gold is non-negative.
+        # Shuffling once and popping still disbands a uniformly random subset, without list.remove.
+        if self.gold < 0 and my_legions: random.shuffle(my_legions)
         while self.gold < 0 and my_legions:
             # print(f"{self} is bankrupt (Gold: {self.gold})! Disbanding a Legion.")
-            disbanded_legion = random.choice(my_legions)
-            board.legions.remove(disbanded_legion)
-            my_legions.remove(disbanded_legion)
+            disbanded_legion = my_legions.pop()
+            board.remove_legion(disbanded_legion)
             self.gold += 1 # Recoup the upkeep cost for the now-disbanded legion.
         
         # A kingdom can remain in debt if it runs out of legions to disband.
@@ -106,8 +117,8 @@ class Kingdom:
         min_dist = float('inf')
         for enemy in board.kingdoms:
             if enemy != self and not enemy.is_eliminated:
-                path = board.find_path(self.capital_pos, enemy.capital_pos)
-                dist = len(path) if path else float('inf')
+                dist = board.path_distance(self.capital_pos, enemy.capital_pos)
+                if dist is None: dist = float('inf')
                 if dist < min_dist:
                     min_dist, primary_target_kingdom = dist, enemy
         if not primary_target_kingdom: return
@@ -122,7 +133,7 @@ class Kingdom:
         for legion in board.get_legions_of(self):
             if not legion.has_moved:
                 target = board.find_closest_enemy_of_kingdom(legion, primary_target_kingdom)
-                if target: board.move_legion_towards(legion, target.x, target.y)
+                if target: board.move_legion_towards(legion, *target)
 
     def _ai_golden(self, board):
         if self.gold >= self.recruit_cost and not board.get_legion_at(*self.capital_pos):
@@ -142,32 +153,32 @@ class Kingdom:
             if legion.has_moved: continue
             enemy_near_capital = board.find_closest_enemy_structure_or_unit(board.get_tile(*self.capital_pos), max_dist=4)
             if enemy_near_capital:
-                board.move_legion_towards(legion, enemy_near_capital.x, enemy_near_capital.y)
+                board.move_legion_towards(legion, *enemy_near_capital)
                 continue
             if crusade_target:
                 target = board.find_closest_enemy_of_kingdom(legion, crusade_target)
-                if target: board.move_legion_towards(legion, target.x, target.y)
+                if target: board.move_legion_towards(legion, *target)
                 continue
             target_forest = board.find_closest_unclaimed_tile_type(legion, 'FOREST')
             if target_forest:
-                board.move_legion_towards(legion, target_forest.x, target_forest.y)
+                board.move_legion_towards(legion, *target_forest)
                 continue
             border_tile = board.find_closest_border_tile(legion)
-            if border_tile: board.move_legion_towards(legion, border_tile.x, border_tile.y)
+            if border_tile: board.move_legion_towards(legion, *border_tile)
 
     def _ai_verdant(self, board):
         if self.gold >= self.recruit_cost and not board.get_legion_at(*self.capital_pos):
             board.create_legion(self, *self.capital_pos)
             self.gold -= self.recruit_cost
             # print(f"{self} recruits a new Legion.")
-        unclaimed_tiles = sum(1 for r in board.grid for t in r if not t.owner and t.tile_type != 'MOUNTAIN')
+        unclaimed_tiles = sum(1 for o, t in zip(board.owner_id, board.tile_type_id) if o == UNOWNED and t != MOUNTAIN_ID)
         is_constrict_phase = unclaimed_tiles < (board.width * board.height * 0.20)
         hunt_target = None
         if is_constrict_phase:
             min_territory = float('inf')
             for enemy in board.kingdoms:
                 if enemy != self and not enemy.is_eliminated:
-                    territory_size = len(board.get_tiles_owned_by(enemy))
+                    territory_size = len(board.tiles_by_owner.get(enemy, ()))
                     if territory_size < min_territory:
                         min_territory, hunt_target = territory_size, enemy
             # if hunt_target: print(f"{self} enters Constriction Phase, hunting {hunt_target}!")
@@ -175,10 +186,10 @@ class Kingdom:
             if legion.has_moved: continue
             if hunt_target:
                 target = board.find_closest_enemy_of_kingdom(legion, hunt_target)
-                if target: board.move_legion_towards(legion, target.x, target.y)
+                if target: board.move_legion_towards(legion, *target)
             else:
                 target = board.find_closest_unclaimed_tile(legion)
-                if target: board.move_legion_towards(legion, target.x, target.y)
+                if target: board.move_legion_towards(legion, *target)
 
     def _ai_azure(self, board):
         avg_legions = board.get_average_enemy_legion_count(self)
@@ -197,19 +208,45 @@ class Kingdom:
                 board.move_legion_towards(legion, *weakest.capital_pos)
             else:
                 target = board.find_closest_unoccupied_enemy_tile(legion)
-                if target: board.move_legion_towards(legion, target.x, target.y)
+                if target: board.move_legion_towards(legion, *target)
                 else:
                     border_tile = board.find_closest_border_tile(legion)
-                    if border_tile: board.move_legion_towards(legion, border_tile.x, border_tile.y)
+                    if border_tile: board.move_legion_towards(legion, *border_tile)
 
 
 class GameBoard:
     def __init__(self, layout):
         self.width, self.height = 0, 0
         self.grid = self._parse_layout(layout)
+        # Structure-of-arrays view of the grid: flat, row-major lists indexed by y*width + x.
+        # owner_id holds Kingdom.id (UNOWNED if none) and is kept in step by set_tile_owner.
+        self.tiles = [t for row in self.grid for t in row]
+        self.tile_pos = [(t.x, t.y) for t in self.tiles]
+        self.tile_type_id = [TILE_TYPE_IDS[t.tile_type] for t in self.tiles]
+        self.owner_id = [UNOWNED] * len(self.tiles)
+        # Flat indices of each tile's in-bounds, non-mountain neighbours (the grid never changes)
+        self._open_neighbours = [
+            [(y + dy) * self.width + x + dx for dx, dy in DIRECTIONS
+             if 0 <= x + dx < self.width and 0 <= y + dy < self.height
+             and self.tile_type_id[(y + dy) * self.width + x + dx] != MOUNTAIN_ID]
+            for y in range(self.height) for x in range(self.width)]
         self.kingdoms = []
         self.legions = []
         self.combat_events_this_turn = []
+        # Lookup indices kept in step with every legion move and ownership change. Per-owner
+        # legions are insertion-ordered dicts so they iterate in the same order as self.legions.
+        self.legions_by_owner = {}
+        self.tiles_by_owner = {}
+        self.legion_at = {}
+        # All-pairs step counts between passable tiles, indexed [y*width + x][y*width + x]
+        self._dist_table = self._build_distance_table()
+        # Memoized shortest paths keyed by (start_pos, end_pos), plus step counts for the
+        # searches the table does not cover (paths leaving a mountain)
+        self._path_cache = {}
+        self._dist_cache = {}
+        # Targets of find_closest_enemy_of_kingdom by target kingdom. An entry is dropped
+        # whenever one of that kingdom's legions is created, removed or moved.
+        self._enemy_target_cache = {}
 
     def _parse_layout(self, layout):
         lines = layout.strip().split('\n')
@@ -232,8 +269,9 @@ class GameBoard:
         k3 = Kingdom("Verdant Swarm", "Verdant", self.capital_starts[3], COLORS['GREEN'])
         k4 = Kingdom("Azure Syndicate", "Azure", self.capital_starts[4], COLORS['BLUE'])
         self.kingdoms = [k1, k2, k3, k4]
+        for i, k in enumerate(self.kingdoms): k.id = i
         for k in self.kingdoms:
-            self.get_tile(*k.capital_pos).owner = k
+            self.set_tile_owner(self.get_tile(*k.capital_pos), k)
             self.create_legion(k, *k.capital_pos)
 
     def run_simulation(self):
@@ -243,6 +281,7 @@ class GameBoard:
             # print(f"====== ROUND {turn_count} ======")
             # self.print_board()
             self.combat_events_this_turn = []
+            self._enemy_target_cache.clear()
             for kingdom in self.kingdoms:
                 if not kingdom.is_eliminated:
                     kingdom.take_turn(self)
@@ -278,13 +317,35 @@ class GameBoard:
         return None
 
     def get_legion_at(self, x, y):
-        return next((l for l in self.legions if l.x == x and l.y == y), None)
+        return self.legion_at.get((x, y))
+
+    def set_tile_owner(self, tile, owner):
+        if tile.owner is not None: self.tiles_by_owner[tile.owner].discard(tile)
+        tile.owner = owner
+        self.owner_id[tile.y * self.width + tile.x] = UNOWNED if owner is None else owner.id
+        if owner is not None: self.tiles_by_owner.setdefault(owner, set()).add(tile)
 
     def create_legion(self, owner, x, y):
         if not self.get_legion_at(x, y):
-            self.legions.append(Legion(owner, x, y))
+            legion = Legion(owner, x, y)
+            self.legions.append(legion)
+            self.legions_by_owner.setdefault(owner, {})[legion] = None
+            self.legion_at[(x, y)] = legion
+            self._enemy_target_cache.pop(owner, None)
             return True
         return False
+
+    def remove_legion(self, legion):
+        self.legions.remove(legion)
+        del self.legions_by_owner[legion.owner][legion]
+        del self.legion_at[(legion.x, legion.y)]
+        self._enemy_target_cache.pop(legion.owner, None)
+
+    def _place_legion(self, legion, x, y):
+        del self.legion_at[(legion.x, legion.y)]
+        legion.x, legion.y = x, y
+        self.legion_at[(x, y)] = legion
+        self._enemy_target_cache.pop(legion.owner, None)
     
     def move_legion_towards(self, legion, target_x, target_y):
         if legion.has_moved: return
@@ -303,8 +364,8 @@ class GameBoard:
                 self._handle_combat(legion, enemy_legion, start_pos)
                 break 
             elif not enemy_legion:
-                legion.x, legion.y = next_x, next_y
-                self.get_tile(next_x, next_y).owner = legion.owner
+                self._place_legion(legion, next_x, next_y)
+                self.set_tile_owner(self.get_tile(next_x, next_y), legion.owner)
                 start_pos = (legion.x, legion.y)
             else: break
         legion.has_moved = True
@@ -322,15 +383,15 @@ class GameBoard:
                 is_supported = True
                 break
         
-        self.legions.remove(defender)
+        self.remove_legion(defender)
         if is_supported:
             # print(f"Supported attack! {attacker.owner}'s Legion survives!")
-            attacker.x, attacker.y = defender.x, defender.y
-            self.get_tile(defender.x, defender.y).owner = attacker.owner
+            self._place_legion(attacker, defender.x, defender.y)
+            self.set_tile_owner(self.get_tile(defender.x, defender.y), attacker.owner)
         else:
             # print("Unsupported attack! Both Legions are destroyed.")
-            self.legions.remove(attacker)
-            self.get_tile(defender.x, defender.y).owner = None
+            self.remove_legion(attacker)
+            self.set_tile_owner(self.get_tile(defender.x, defender.y), None)
 
     def _check_capital_conquests(self):
         for k_defend in self.kingdoms:
@@ -340,82 +401,170 @@ class GameBoard:
                 k_attack = occupying_legion.owner
                 # print(f"MAJOR EVENT: {k_attack} has captured the capital of {k_defend}!")
                 k_attack.gold += k_defend.gold
-                for tile in self.get_tiles_owned_by(k_defend):
-                    tile.owner = k_attack
+                for tile in list(self.tiles_by_owner.get(k_defend, ())):
+                    self.set_tile_owner(tile, k_attack)
                 # Remove all of the defeated kingdom's legions
                 for legion in self.get_legions_of(k_defend):
-                    if legion in self.legions:
-                        self.legions.remove(legion)
+                    self.remove_legion(legion)
                 k_defend.is_eliminated = True
     
-    def get_legions_of(self, kingdom): return [l for l in self.legions if l.owner == kingdom]
-    def get_tiles_owned_by(self, kingdom): return [t for row in self.grid for t in row if t.owner == kingdom]
-
-    def find_path(self, start_pos, end_pos):
-        q = collections.deque([[start_pos]])
-        visited = {start_pos}
-        while q:
-            path = q.popleft()
-            x, y = path[-1]
-            if (x, y) == end_pos: return path
-            for dx, dy in [(0,1), (0,-1), (1,0), (-1,0)]:
+    def get_legions_of(self, kingdom): return list(self.legions_by_owner.get(kingdom, ()))
+
+    def _build_distance_table(self):
+        # One breadth-first search per passable tile over the static mountain layout. Moves
+        # between passable tiles are symmetric, so row i also holds every tile's steps to i.
+        # Mountain rows are None; unreachable entries are None.
+        passable = [t != MOUNTAIN_ID for t in self.tile_type_id]
+        neighbours = self._open_neighbours
+        table = []
+        for source, is_passable in enumerate(passable):
+            if not is_passable:
+                table.append(None)
+                continue
+            row = [None] * len(passable)
+            row[source] = 0
+            frontier, steps = [source], 0
+            while frontier:
+                steps += 1
+                next_frontier = []
+                for i in frontier:
+                    for n in neighbours[i]:
+                        if row[n] is None:
+                            row[n] = steps
+                            next_frontier.append(n)
+                frontier = next_frontier
+            table.append(row)
+        return table
+
+    def _search_to(self, start_pos, end_pos):
+        # A* with a Manhattan-distance heuristic, searched backwards from end_pos so every tile's
+        # g is its exact distance to the goal. Expansion continues through every tile with
+        # f <= the shortest distance, which closes all tiles on any shortest path.
+        # Returns (shortest step count or None, {pos: steps to end_pos}).
+        grid, width, height = self.grid, self.width, self.height
+        sx, sy = start_pos
+        if start_pos != end_pos and grid[end_pos[1]][end_pos[0]].tile_type == 'MOUNTAIN': return None, None
+        dist_to_end = {}
+        best_g = {end_pos: 0}
+        open_heap = [(abs(end_pos[0] - sx) + abs(end_pos[1] - sy), 0, end_pos)]
+        shortest = None
+        while open_heap:
+            f, g, pos = heapq.heappop(open_heap)
+            if shortest is not None and f > shortest: break
+            if pos in dist_to_end: continue
+            dist_to_end[pos] = g
+            if pos == start_pos:
+                shortest = g
+                continue
+            x, y = pos
+            for dx, dy in DIRECTIONS:
                 nx, ny = x + dx, y + dy
-                if self.get_tile(nx, ny) and self.get_tile(nx, ny).tile_type != 'MOUNTAIN' and (nx, ny) not in visited:
-                    visited.add((nx, ny))
-                    q.append(list(path) + [(nx, ny)])
-        return None
+                if not (0 <= nx < width and 0 <= ny < height): continue
+                npos = (nx, ny)
+                # Only the start tile may be left from a mountain
+                if npos in dist_to_end or (grid[ny][nx].tile_type == 'MOUNTAIN' and npos != start_pos): continue
+                ng = g + 1
+                if ng < best_g.get(npos, ng + 1):
+                    best_g[npos] = ng
+                    heapq.heappush(open_heap, (ng + abs(nx - sx) + abs(ny - sy), ng, npos))
+        return shortest, dist_to_end
 
-    def find_closest_target(self, legion, target_list):
+    def find_path(self, start_pos, end_pos):
+        # Mountains never move and legions do not block paths, so a path is valid for the whole
+        # game once found. Reversed paths are not reused: the reverse of the chosen path is not
+        # necessarily the one the search picks from the other end.
+        if start_pos == end_pos: return [start_pos]
+        key = (start_pos, end_pos)
+        if key in self._path_cache: return self._path_cache[key]
+        width, height = self.width, self.height
+        (sx, sy), (ex, ey) = start_pos, end_pos
+        end_row = self._dist_table[ey * width + ex]
+        if end_row is not None and self._dist_table[sy * width + sx] is not None:
+            shortest = end_row[sy * width + sx]
+            steps_to_end = lambda x, y: end_row[y * width + x] if 0 <= x < width and 0 <= y < height else None
+        else:
+            shortest, dist_to_end = self._search_to(start_pos, end_pos)
+            steps_to_end = lambda x, y: dist_to_end.get((x, y))
+        if shortest is None:
+            self._path_cache[key] = None
+            return None
+
+        # Walk forwards taking the first neighbour (in DIRECTIONS order) one step closer to the
+        # goal; that is the same path a breadth-first search with this neighbour order returns.
+        path = [start_pos]
+        x, y = start_pos
+        for remaining in range(shortest - 1, -1, -1):
+            for dx, dy in DIRECTIONS:
+                if steps_to_end(x + dx, y + dy) == remaining:
+                    x, y = x + dx, y + dy
+                    break
+            path.append((x, y))
+        self._path_cache[key] = path
+        return path
+
+    def path_distance(self, start_pos, end_pos):
+        # Number of steps on the shortest path (None if unreachable), without building the path
+        start_row = self._dist_table[start_pos[1] * self.width + start_pos[0]]
+        if start_row is not None: return start_row[end_pos[1] * self.width + end_pos[0]]
+        key = (start_pos, end_pos)
+        if key not in self._dist_cache: self._dist_cache[key] = self._search_to(start_pos, end_pos)[0]
+        return self._dist_cache[key]
+
+    # Targets are (x, y) tuples; the first of the nearest ones is returned
+    def find_closest_target(self, legion, target_coords):
         closest, min_dist = None, float('inf')
-        for target in target_list:
-            path = self.find_path((legion.x, legion.y), (target.x, target.y))
-            if path and len(path) < min_dist:
-                min_dist, closest = len(path), target
+        start_pos = (legion.x, legion.y)
+        for target in target_coords:
+            dist = self.path_distance(start_pos, target)
+            if dist is not None and dist < min_dist:
+                min_dist, closest = dist, target
         return closest
 
     def find_closest_enemy_structure_or_unit(self, start_tile, max_dist=float('inf')):
         targets = []
         for k in self.kingdoms:
-            if k != start_tile.owner and not k.is_eliminated: targets.append(self.get_tile(*k.capital_pos))
+            if k != start_tile.owner and not k.is_eliminated: targets.append(k.capital_pos)
         for l in self.legions:
-            if l.owner != start_tile.owner: targets.append(l)
+            if l.owner != start_tile.owner: targets.append((l.x, l.y))
         
-        class Pos:
-            def __init__(self, x, y): self.x, self.y = x, y
-        proxies = [Pos(t.x, t.y) for t in targets]
+        start_pos = (start_tile.x, start_tile.y)
         closest, min_dist_val = None, float('inf')
-        for target in proxies:
-            path = self.find_path((start_tile.x, start_tile.y), (target.x, target.y))
-            if path and len(path) < min_dist_val and len(path) <= max_dist:
-                min_dist_val, closest = len(path), target
+        for target in targets:
+            # max_dist counts tiles on the path, one more than its steps
+            dist = self.path_distance(start_pos, target)
+            if dist is not None and dist < min_dist_val and dist + 1 <= max_dist:
+                min_dist_val, closest = dist, target
         return closest
         
     def find_closest_enemy_of_kingdom(self, legion, target_kingdom):
-        targets = self.get_legions_of(target_kingdom) + [self.get_tile(*target_kingdom.capital_pos)]
-        class Pos:
-            def __init__(self, x, y): self.x, self.y = x, y
-        return self.find_closest_target(legion, [Pos(t.x, t.y) for t in targets])
+        # Every legion of the attacking kingdom asks about the same target kingdom, whose
+        # legions only change through combat, so the target list is shared until then
+        targets = self._enemy_target_cache.get(target_kingdom)
+        if targets is None:
+            targets = [(l.x, l.y) for l in self.get_legions_of(target_kingdom)] + [target_kingdom.capital_pos]
+            self._enemy_target_cache[target_kingdom] = targets
+        return self.find_closest_target(legion, targets)
 
     def find_closest_unclaimed_tile_type(self, legion, tile_type):
-        targets = [t for r in self.grid for t in r if not t.owner and t.tile_type == tile_type]
+        type_id = TILE_TYPE_IDS[tile_type]
+        targets = [self.tile_pos[i] for i, (o, t) in enumerate(zip(self.owner_id, self.tile_type_id)) if o == UNOWNED and t == type_id]
         return self.find_closest_target(legion, targets)
 
     def find_closest_unclaimed_tile(self, legion):
-        targets = [t for r in self.grid for t in r if not t.owner and t.tile_type != 'MOUNTAIN']
+        targets = [self.tile_pos[i] for i, (o, t) in enumerate(zip(self.owner_id, self.tile_type_id)) if o == UNOWNED and t != MOUNTAIN_ID]
         return self.find_closest_target(legion, targets)
         
     def find_closest_border_tile(self, legion):
-        border_tiles = []
-        for tile in self.get_tiles_owned_by(legion.owner):
-            for dx, dy in [(0,1), (0,-1), (1,0), (-1,0)]:
-                neighbor = self.get_tile(tile.x+dx, tile.y+dy)
-                if neighbor and neighbor.owner != legion.owner and neighbor.tile_type != 'MOUNTAIN':
-                    border_tiles.append(tile)
-                    break
+        # A border tile is one of ours with an open neighbour that isn't ours; row-major order
+        my_id, owner_id = legion.owner.id, self.owner_id
+        border_tiles = [self.tile_pos[i] for i, o in enumerate(owner_id)
+                        if o == my_id and any(owner_id[j] != my_id for j in self._open_neighbours[i])]
         return self.find_closest_target(legion, border_tiles)
 
     def find_closest_unoccupied_enemy_tile(self, legion):
-        targets = [t for r in self.grid for t in r if t.owner and t.owner != legion.owner and not self.get_legion_at(t.x, t.y)]
+        my_id, tile_pos = legion.owner.id, self.tile_pos
+        targets = [tile_pos[i] for i, o in enumerate(self.owner_id)
+                   if o != UNOWNED and o != my_id and tile_pos[i] not in self.legion_at]
         return self.find_closest_target(legion, targets)
 
     def find_weakest_kingdom(self, perspective_kingdom):
@@ -433,7 +582,7 @@ class GameBoard:
     def check_azure_spoils(self, azure_kingdom):
         gold_gain = 0
         my_border_coords = set()
-        for tile in self.get_tiles_owned_by(azure_kingdom):
+        for tile in self.tiles_by_owner.get(azure_kingdom, ()):
             for dx, dy in [(0,1), (0,-1), (1,0), (-1,0)]: my_border_coords.add((tile.x+dx, tile.y+dy))
         for event in self.combat_events_this_turn:
             if event['attacker'] != azure_kingdom and event['defender'] != azure_kingdom and event['location'] in my_border_coords: